@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# 从 Homework1 目录导入 src 包
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.data_analyzer import DataAnalyzer
+
+
+def make_raw_frame(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    # 生成与采集结果列结构一致的模拟数据
+    rng = np.random.default_rng(seed)
+    industries = np.array([f" 行业{i} " for i in range(60)] + [None], dtype=object)
+    locations = np.array([f"城市{i}" for i in range(120)] + [None], dtype=object)
+    ages = np.array([str(age) for age in range(25, 95)] + ['未知', None], dtype=object)
+    return pd.DataFrame({
+        'name': [f"富豪{i}" for i in range(n_rows)],
+        'wealth': rng.lognormal(4, 1, n_rows).round(1),
+        'age': ages[rng.integers(0, len(ages), n_rows)],
+        'industry': industries[rng.integers(0, len(industries), n_rows)],
+        'headquarters': locations[rng.integers(0, len(locations), n_rows)],
+        'gender': rng.choice(['先生', '女士', '未知'], n_rows, p=[0.9, 0.08, 0.02]),
+    })
+
+
+def time_clean(raw: pd.DataFrame, method_name: str) -> float:
+    # 绕过 __init__ 中的清洗，只计时清洗本身
+    analyzer = DataAnalyzer(pd.DataFrame())
+    analyzer.data = raw.copy()
+    start = time.perf_counter()
+    getattr(analyzer, method_name)()
+    return time.perf_counter() - start
+
+
+def main(sizes=(1_000, 100_000, 1_000_000)) -> None:
+    print(f"{'行数':>10} {'逐行apply(秒)':>14} {'向量化(秒)':>12} {'加速比':>8}")
+    for n_rows in sizes:
+        raw = make_raw_frame(n_rows)
+        old = time_clean(raw, '_clean_data_rowwise')
+        new = time_clean(raw, 'clean_data')
+        print(f"{n_rows:>10} {old:>14.3f} {new:>12.3f} {old / new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+# 从 Homework1 目录导入 src 包
+HOMEWORK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(HOMEWORK_DIR)
+
+from src.data_collector import DataCollector
+from src.replay import ReplayServer, load_fixtures, record_fixtures, rows_from_frame
+
+
+def load_rows(fixture_dir: str, list_id: str):
+    # 优先使用录制的接口数据，没有时由仓库中的 hurun_raw_data.csv 还原
+    if os.path.isdir(fixture_dir):
+        fixtures = load_fixtures(fixture_dir)
+        if list_id in fixtures:
+            return fixtures[list_id]
+    raw = pd.read_csv(os.path.join(HOMEWORK_DIR, 'hurun_raw_data.csv'), encoding='utf-8-sig')
+    return rows_from_frame(raw)
+
+
+def time_collect(base_url: str, max_pages: int, concurrent: bool, workers: int) -> tuple:
+    # 令牌桶速率放开，只测采集本身的吞吐
+    collector = DataCollector(pool_size=max(workers, 1), backoff_factor=0.05, base_url=base_url)
+    start = time.perf_counter()
+    rows = collector.collect_all_data(max_pages=max_pages, concurrent=concurrent,
+                                      max_workers=workers, rate_limit=1000.0)
+    return time.perf_counter() - start, len(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="用本地回放服务对比串行与并发采集的吞吐")
+    parser.add_argument('--fixtures', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures'))
+    parser.add_argument('--record', action='store_true', help="先从胡润官网录制一次接口数据")
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.05, help="模拟的单次响应延迟（秒）")
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4, 8])
+    args = parser.parse_args()
+
+    list_id = DataCollector().list_id
+    if args.record:
+        record_fixtures(DataCollector(), args.fixtures, max_pages=args.pages)
+
+    server = ReplayServer({list_id: load_rows(args.fixtures, list_id)}, latency=args.latency,
+                          jitter=args.jitter, error_rate=args.error_rate, seed=0)
+    results = []
+    with server:
+        elapsed, count = time_collect(server.base_url, args.pages, False, 1)
+        results.append(("串行", elapsed, count))
+        for workers in args.workers:
+            elapsed, count = time_collect(server.base_url, args.pages, True, workers)
+            results.append((f"并发 x{workers}", elapsed, count))
+
+    print(f"\n回放服务：延迟 {args.latency * 1000:.0f}±{args.jitter * 1000:.0f} ms，"
+          f"错误率 {args.error_rate:.0%}，共处理 {server.request_count} 次请求（注入错误 {server.error_count} 次）")
+    print(f"{'模式':<10} {'耗时(秒)':>10} {'条数':>8} {'页/秒':>8} {'加速比':>8}")
+    baseline = results[0][1]
+    for label, elapsed, count in results:
+        pages = -(-count // 20)
+        print(f"{label:<10} {elapsed:>10.2f} {count:>8} {pages / elapsed:>8.1f} {baseline / elapsed:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
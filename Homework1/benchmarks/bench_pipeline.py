@@ -0,0 +1,148 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# 从 Homework1 目录导入 src 包
+HOMEWORK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(HOMEWORK_DIR)
+
+from src.data_analyzer import DataAnalyzer
+from src.data_visualizer import DASHBOARD_CHARTS, DataVisualizer
+from src.synthetic import generate_rankings
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# 逐项计时的分析方法
+ANALYSIS_METHODS = [
+    'analyze_industry',
+    'analyze_age_distribution',
+    'analyze_gender_distribution',
+    'analyze_location_distribution',
+    'analyze_wealth_distribution',
+    'analyze_inequality',
+    'get_top_lists',
+]
+
+
+def time_call(func, repeat: int, setup=None) -> dict:
+    # 每次计时前执行 setup（如清空缓存），只统计 func 本身的耗时
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        'min': round(min(timings), 6),
+        'median': round(statistics.median(timings), 6),
+        'repeat': repeat,
+    }
+
+
+def bench_size(n_rows: int, repeat: int, charts: bool, reference) -> list:
+    results = []
+
+    def add(name, timing):
+        results.append(dict(timing, size=n_rows, name=name))
+        print(f"{n_rows:>10} {name:<32} {timing['min']:>10.4f} {timing['median']:>10.4f}")
+
+    add('generate_rankings', time_call(lambda: generate_rankings(n_rows, reference=reference), 1))
+    raw = generate_rankings(n_rows, reference=reference)
+
+    # 清洗：DataAnalyzer 构造时完成，这里单独计时 clean_data
+    analyzer = DataAnalyzer(raw)
+    fresh = {}
+
+    def reset():
+        fresh['analyzer'] = DataAnalyzer(pd.DataFrame())
+        fresh['analyzer'].data = raw.copy()
+
+    add('clean_data', time_call(lambda: fresh['analyzer'].clean_data(), repeat, reset))
+
+    for method_name in ANALYSIS_METHODS:
+        add(method_name, time_call(getattr(analyzer, method_name), repeat, analyzer.clear_caches))
+    add('comprehensive_analysis', time_call(analyzer.comprehensive_analysis, repeat, analyzer.clear_caches))
+
+    if charts:
+        analysis_results = analyzer.comprehensive_analysis()
+        with tempfile.TemporaryDirectory() as output_dir:
+            visualizer = DataVisualizer(output_dir, incremental=False)
+            for key, method_name in DASHBOARD_CHARTS:
+                if analysis_results.get(key):
+                    plot = getattr(visualizer, method_name)
+                    add(method_name, time_call(lambda: plot(analysis_results[key]), 1))
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HOMEWORK_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def compare(previous_file: str, results: list) -> None:
+    # 与之前保存的结果对比，比值大于 1 表示变慢
+    with open(previous_file, 'r', encoding='utf-8') as f:
+        previous = {(item['size'], item['name']): item for item in json.load(f)['results']}
+    print(f"\n与 {previous_file} 对比（中位数耗时之比，>1 表示变慢）")
+    for item in results:
+        old = previous.get((item['size'], item['name']))
+        if old and old['median'] > 0:
+            ratio = item['median'] / old['median']
+            flag = '  <-- 变慢' if ratio > 1.2 else ''
+            print(f"{item['size']:>10} {item['name']:<32} {ratio:>8.2f}{flag}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="用合成数据测试分析与绘图在不同数据规模下的耗时")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--charts', action='store_true', help="同时计时各图表的渲染")
+    parser.add_argument('--reference', action='store_true',
+                        help="按 hurun_raw_data.csv 中的行业、地区频率生成数据")
+    parser.add_argument('--output', default=None, help="结果 JSON 路径，默认写入 benchmarks/results/")
+    parser.add_argument('--compare', default=None, help="与之前的结果 JSON 对比")
+    args = parser.parse_args()
+
+    reference = None
+    if args.reference:
+        reference = pd.read_csv(os.path.join(HOMEWORK_DIR, 'hurun_raw_data.csv'), encoding='utf-8-sig')
+
+    print(f"{'行数':>10} {'项目':<32} {'最短(秒)':>10} {'中位数(秒)':>10}")
+    results = []
+    for n_rows in args.sizes:
+        results.extend(bench_size(n_rows, args.repeat, args.charts, reference))
+
+    timestamp = datetime.datetime.now()
+    output = args.output or os.path.join(RESULTS_DIR, f"bench_{timestamp.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'timestamp': timestamp.isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'results': results,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已保存到：{output}")
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 各次作业共用的模块（如 HTTP 缓存）位于仓库根目录的 common 包中
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
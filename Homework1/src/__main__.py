@@ -0,0 +1,6 @@
+import sys
+
+from .cli import main
+
+# 用法：python -m src [数据文件] [--stages ...]，完整参数见 python -m src --help
+sys.exit(main())
@@ -0,0 +1,68 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+
+class CrawlCheckpoint:
+
+    def __init__(self, path: str, list_id: str = "", fresh: bool = False):
+        # 追加写入的 JSONL 日志，每行记录一页原始数据，以 (list_id, offset) 为键
+        # 日志只用于中断后续采，完整采集一次后由 clear 删除；fresh=True 时丢弃已有日志重新采集
+        self.path = path
+        self.list_id = list_id
+        self.pages: Dict[int, List[Dict]] = {}
+        self.lock = threading.Lock()
+        if fresh:
+            self.clear()
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 进程中断时最后一行可能只写了一半，直接忽略
+                    continue
+                if record.get('list_id', '') != self.list_id:
+                    continue
+                self.pages[int(record['offset'])] = record['rows']
+
+        if self.pages:
+            print(f"从断点恢复：{self.path} 中已有 {len(self.pages)} 页数据")
+
+    def get(self, offset: int) -> Optional[List[Dict]]:
+        with self.lock:
+            return self.pages.get(offset)
+
+    def __contains__(self, offset: int) -> bool:
+        with self.lock:
+            return offset in self.pages
+
+    def clear(self) -> None:
+        # 删除日志文件，下次采集从头开始请求
+        with self.lock:
+            self.pages = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def commit(self, offset: int, rows: List[Dict]) -> None:
+        with self.lock:
+            if offset in self.pages:
+                return
+            record = {'list_id': self.list_id, 'offset': offset, 'rows': rows}
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.pages[offset] = rows
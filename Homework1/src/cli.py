@@ -0,0 +1,285 @@
+import argparse
+import os
+import traceback
+from typing import Dict, List, Optional
+
+from .data_collector import HURUN_RANKINGS, DataCollector
+from .data_analyzer import DataAnalyzer
+from .data_visualizer import DASHBOARD_CHARTS, DataVisualizer
+from .report_generator import ReportGenerator
+from .profiler import StageProfiler
+from .storage import load_frame, save_frame
+from common.http_cache import HttpCache
+
+# 流水线各阶段，按执行顺序排列
+STAGES = ['collect', 'clean', 'analyze', 'charts', 'report']
+
+# 命令行中的图表简称 -> 绘图方法名，如 wealth -> plot_wealth_distribution
+CHART_NAMES = {method_name.split('_')[1]: method_name for _, method_name in DASHBOARD_CHARTS}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src",
+        description="胡润百富榜数据采集、分析、可视化与报告生成",
+    )
+    parser.add_argument('input', nargs='?', default=None,
+                        help="已保存的数据文件（csv / parquet / feather），指定时跳过采集；"
+                             "执行 clean 阶段时为原始数据，否则为清洗后数据")
+    parser.add_argument('--input', dest='input_option', default=None, metavar='FILE',
+                        help="同位置参数 input")
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help=f"要执行的阶段，逗号分隔，可选：{','.join(STAGES)}（默认全部）")
+
+    collect = parser.add_argument_group("采集")
+    collect.add_argument('--pages', type=int, default=50, help="最多采集的页数（默认 50）")
+    collect.add_argument('--workers', type=int, default=1, help="并发采集线程数，1 为串行（默认 1）")
+    collect.add_argument('--rate-limit', type=float, default=1.0, help="每秒最多请求数（默认 1）")
+    collect.add_argument('--list-id', default=None, help="榜单编号，默认 2024 年榜单")
+    collect.add_argument('--rankings', default=None, metavar='YEAR=ID,...',
+                         help="同时采集多个年份的榜单，如 2023=XXXX,2024=ODBYW2BI；"
+                              f"已知编号的年份（{','.join(map(str, HURUN_RANKINGS))}）可只写年份。"
+                              "指定时忽略 --list-id")
+    collect.add_argument('--rankings-dir', default="hurun_rankings",
+                         help="多年份榜单按年份分区保存的目录（默认 hurun_rankings）")
+    collect.add_argument('--base-url', default=None, help="榜单接口地址，可指向本地回放服务")
+    collect.add_argument('--no-cache', action='store_true', help="不使用本地 HTTP 缓存")
+    collect.add_argument('--checkpoint', default="hurun_crawl_checkpoint.jsonl",
+                         help="断点日志路径，传空字符串关闭断点续采；完整采集后自动删除")
+    collect.add_argument('--fresh', action='store_true', help="丢弃已有的断点日志，全部重新采集")
+
+    output = parser.add_argument_group("输出")
+    output.add_argument('--raw-output', default="hurun_raw_data.csv",
+                        help="原始数据文件；跳过采集且未指定 input 时 clean 阶段从这里读取")
+    output.add_argument('--cleaned-output', default="hurun_cleaned_data.csv",
+                        help="清洗后数据文件；跳过采集且未指定 input 时从这里读取")
+    output.add_argument('--charts', default=None,
+                        help=f"只渲染这些图表，逗号分隔，可选：{','.join(CHART_NAMES)}（默认全部）")
+    output.add_argument('--chart-dir', default="charts", help="图表目录")
+    output.add_argument('--parallel-charts', action='store_true', help="在多个进程中并行渲染图表")
+    output.add_argument('--chart-workers', type=int, default=None, help="并行渲染的进程数")
+    output.add_argument('--report', default="胡润百富榜分析报告.txt",
+                        help="报告文件，后缀 .md / .html 时输出对应格式")
+    output.add_argument('--year', type=int, default=None,
+                        help="分析与报告的榜单年份；多年份数据默认取最近一年，单年份数据默认 2024")
+
+    profiling = parser.add_argument_group("性能分析")
+    profiling.add_argument('--profile', default=None, metavar='FILE', help="各阶段耗时与内存峰值的 JSON 输出")
+    profiling.add_argument('--cprofile', default=None, metavar='FILE', help="cProfile 结果输出（pstats 格式）")
+    return parser
+
+
+def parse_stages(value: str) -> List[str]:
+    stages = [stage.strip() for stage in value.split(',') if stage.strip()]
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        raise ValueError(f"未知的阶段：{', '.join(unknown)}，可选：{', '.join(STAGES)}")
+    return stages
+
+
+def parse_rankings(value: Optional[str]) -> Optional[Dict[int, str]]:
+    # "2023=XXXX,2024" -> {2023: 'XXXX', 2024: HURUN_RANKINGS[2024]}
+    if not value:
+        return None
+    rankings = {}
+    for item in value.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        year, _, list_id = item.partition('=')
+        if not year.strip().isdigit():
+            raise ValueError(f"无法识别的榜单：{item}，格式为 年份=榜单编号")
+        year = int(year)
+        list_id = list_id.strip() or HURUN_RANKINGS.get(year)
+        if not list_id:
+            raise ValueError(f"未知 {year} 年榜单的编号，请以 {year}=榜单编号 的形式指定")
+        rankings[year] = list_id
+    return rankings
+
+
+def parse_charts(value: Optional[str]) -> Optional[List[str]]:
+    if not value:
+        return None
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in CHART_NAMES]
+    if unknown:
+        raise ValueError(f"未知的图表：{', '.join(unknown)}，可选：{', '.join(CHART_NAMES)}")
+    return [CHART_NAMES[name] for name in names]
+
+
+def existing_chart_paths(chart_dir: str, charts: Optional[List[str]]) -> List[str]:
+    # 跳过图表阶段时，报告中列出图表目录里已有的图片
+    paths = []
+    for _, method_name in DASHBOARD_CHARTS:
+        if charts is not None and method_name not in charts:
+            continue
+        path = os.path.join(chart_dir, getattr(DataVisualizer, method_name).default_filename)
+        if os.path.exists(path):
+            paths.append(path)
+    return paths
+
+
+def collect_data(args, profiler: StageProfiler):
+    # 数据采集
+    # 榜单数据半天内视为新鲜，重复运行时直接读取本地缓存
+    cache = None if args.no_cache else HttpCache(".http_cache", max_age=12 * 3600)
+    collector = DataCollector(pool_size=max(args.workers, 10), cache=cache,
+                              base_url=args.base_url, list_id=args.list_id)
+    
+    rankings = parse_rankings(args.rankings)
+    if rankings:
+        # 多个年份的榜单并发采集，按年份分区保存，合并后的数据（带 year 列）另存为原始数据文件
+        with profiler.stage("collect_rankings"):
+            df = collector.collect_rankings(rankings, max_pages=args.pages, rate_limit=args.rate_limit,
+                                            checkpoint_file=args.checkpoint or None, fresh=args.fresh)
+        if df.empty:
+            return None
+        collector.save_rankings(args.rankings_dir)
+        save_frame(df, args.raw_output)
+        print(f"数据已保存到 {args.raw_output}")
+        return df
+    
+    # 采集进度写入断点日志，中断后重新运行会跳过已完成的页
+    with profiler.stage("collect_all_data"):
+        raw_data = collector.collect_all_data(max_pages=args.pages, concurrent=args.workers > 1,
+                                              max_workers=args.workers, rate_limit=args.rate_limit,
+                                              checkpoint_file=args.checkpoint or None, fresh=args.fresh)
+    if not raw_data:
+        return None
+
+    # 保存原始数据
+    collector.save_data(args.raw_output)
+    return collector.get_data_frame()
+
+
+def print_summary(analysis_results: Dict) -> None:
+    # 行业分析
+    industry_analysis = analysis_results.get('industry_analysis', {})
+    if industry_analysis.get('industry_count'):
+        top_industry = list(industry_analysis['industry_count'].items())[0]
+        print(f"主要行业：{top_industry[0]}（{top_industry[1]}人）")
+
+    # 财富统计
+    wealth_analysis = analysis_results.get('wealth_analysis', {})
+    if wealth_analysis.get('wealth_stats'):
+        wealth_stats = wealth_analysis['wealth_stats']
+        print(f"平均财富：{wealth_stats.get('mean', 0):.2f}亿元")
+        print(f"财富总值：{wealth_stats.get('total', 0):.2f}亿元")
+
+    # 年龄统计
+    age_analysis = analysis_results.get('age_analysis', {})
+    if age_analysis.get('age_stats'):
+        age_stats = age_analysis['age_stats']
+        print(f"平均年龄：{age_stats.get('mean', 0):.1f}岁")
+
+    # 地区分布
+    location_analysis = analysis_results.get('location_analysis', {})
+    if location_analysis.get('location_count'):
+        top_location = list(location_analysis['location_count'].items())[0]
+        print(f"主要地区：{top_location[0]}（{top_location[1]}人）")
+
+
+def run_pipeline(args, profiler: StageProfiler) -> bool:
+    stages = parse_stages(args.stages)
+    charts = parse_charts(args.charts)
+    input_file = args.input_option or args.input
+
+    # 图表和报告依赖分析结果；指定了输入文件时不再采集
+    if input_file and 'collect' in stages:
+        stages.remove('collect')
+    need_analysis = any(stage in stages for stage in ('analyze', 'charts', 'report'))
+
+    raw_df = None
+    if 'collect' in stages:
+        raw_df = collect_data(args, profiler)
+        if raw_df is None:
+            print("数据采集失败，程序终止")
+            return False
+
+    # 只有选择了 clean 阶段，或刚采集的数据要继续分析时才清洗；只有 clean 阶段保存清洗结果
+    analyzer = None
+    if 'clean' in stages or (raw_df is not None and need_analysis):
+        if raw_df is None:
+            source = input_file or args.raw_output
+            if not os.path.exists(source):
+                print(f"找不到原始数据文件：{source}，请先执行采集或通过 --input 指定")
+                return False
+            with profiler.stage("load_raw_data"):
+                raw_df = load_frame(source)
+            print(f"已从 {source} 读取 {len(raw_df)} 条原始数据")
+        with profiler.stage("clean_data"):
+            analyzer = DataAnalyzer(raw_df, year=args.year)
+        if 'clean' in stages:
+            analyzer.save_cleaned_data(args.cleaned_output)
+    elif need_analysis:
+        source = input_file or args.cleaned_output
+        if not os.path.exists(source):
+            print(f"找不到数据文件：{source}，请先执行采集、清洗或通过 --input 指定")
+            return False
+        with profiler.stage("load_cleaned_data"):
+            analyzer = DataAnalyzer.load_cleaned_data(source, year=args.year)
+
+    if not need_analysis:
+        return True
+
+    with profiler.stage("comprehensive_analysis"):
+        analysis_results = analyzer.comprehensive_analysis()
+    print(f"分析完成，共处理 {analysis_results['basic_stats']['total_count']} 条数据")
+
+    # 数据可视化
+    if 'charts' in stages:
+        visualizer = DataVisualizer(output_dir=args.chart_dir, profiler=profiler)
+        with profiler.stage("create_comprehensive_dashboard"):
+            chart_paths = visualizer.create_comprehensive_dashboard(
+                analysis_results, parallel=args.parallel_charts,
+                max_workers=args.chart_workers, charts=charts)
+        for chart_path in chart_paths:
+            if os.path.exists(chart_path):
+                print(f"图表文件：{chart_path}")
+    else:
+        chart_paths = existing_chart_paths(args.chart_dir, charts)
+
+    # 生成报告
+    if 'report' in stages:
+        year = analyzer.analysis_year or args.year or 2024
+        report_generator = ReportGenerator(analysis_results, chart_paths, year=year)
+        with profiler.stage("generate_full_report"):
+            report_file = report_generator.generate_full_report(args.report)
+        print(f"分析报告：{report_file}")
+
+    print_summary(analysis_results)
+    return True
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        parse_stages(args.stages)
+        parse_charts(args.charts)
+        parse_rankings(args.rankings)
+    except ValueError as e:
+        parser.error(str(e))
+
+    profiler = StageProfiler(enabled=bool(args.profile or args.cprofile), use_cprofile=bool(args.cprofile))
+    profiler.start()
+    succeeded = False
+    try:
+        succeeded = run_pipeline(args, profiler)
+        if succeeded:
+            print("\n数据分析项目执行成功！")
+    except KeyboardInterrupt:
+        print("\n用户中断执行")
+    except Exception as e:
+        print(f"\n程序执行出错：{e}")
+        print("详细错误信息：")
+        traceback.print_exc()
+    finally:
+        profiler.stop()
+        if profiler.records:
+            profiler.print_summary()
+            if args.profile:
+                profiler.save(args.profile)
+            if args.cprofile:
+                profiler.save_cprofile(args.cprofile)
+    return 0 if succeeded else 1
@@ -1,14 +1,49 @@
+import numpy as np
 import pandas as pd
-from typing import Dict
+from typing import Dict, List, Optional
 import re
+from .storage import load_frame, save_frame
+from .ranking_index import RankingIndex
+from .inequality import concentration_index, inequality_by_group, lorenz_curve, stats_to_dict
 
 class DataAnalyzer:
     
-    def __init__(self, data: pd.DataFrame):
-        self.data = data.copy()
+    def __init__(self, data: pd.DataFrame, copy: bool = True, downcast: bool = False,
+                 year: Optional[int] = None):
+        # copy=False 时只做浅拷贝：派生列加在新的 DataFrame 对象上，不会改动调用方的数据，也不复制原有列
+        # downcast=True 时把数值列降到够用的最小精度，重复度高的文本列转为分类类型，以降低内存占用
+        # year：多年份数据（含 year 列）中单年分析使用的年份，默认最近一年
+        self.data = data.copy(deep=copy)
+        self.downcast = downcast
+        self.year = year
         self.clean_data()
     
+    def clear_caches(self) -> None:
+        # 分组聚合、排序索引和姓名查找表都基于当前数据，数据变化后需要清空
+        self._group_stats = {}
+        self._ranking_indexes = {}
+        self._name_positions = None
+        self._year_data = None
+    
+    @property
+    def analysis_year(self) -> Optional[int]:
+        # 单年分析所用的年份：指定的 year，默认数据中最近的一年；没有 year 列时为 None
+        if 'year' not in self.data.columns or self.data.empty:
+            return None
+        return self.year if self.year is not None else int(self.data['year'].max())
+    
+    @property
+    def year_data(self) -> pd.DataFrame:
+        # 行业、年龄、地区、财富、不平等和排行榜等单年分析使用的数据，避免把多个年份的榜单混在一起统计；
+        # 年度变化分析仍使用全部年份的 self.data
+        if self._year_data is None:
+            year = self.analysis_year
+            self._year_data = self.data if year is None else self.data[self.data['year'] == year]
+        return self._year_data
+    
     def clean_data(self) -> None:
+        # 清洗后数据发生变化，分组聚合缓存和排序索引随之失效
+        self.clear_caches()
         if self.data.empty:
             return
             
@@ -16,21 +51,75 @@ class DataAnalyzer:
         if 'wealth' in self.data.columns:
             self.data['wealth_numeric'] = pd.to_numeric(self.data['wealth'], errors='coerce').fillna(0)
         
-        # 处理年龄：提取数字部分
+        # 处理年龄：向量化提取第一个数字，无法识别的记为0
         if 'age' in self.data.columns:
-            self.data['age_numeric'] = self.data['age'].apply(self._extract_age_value)
+            codes, uniques = pd.factorize(self.data['age'])
+            age_digits = pd.Series(uniques).astype('string').str.extract(r'(\d+)', expand=False)
+            ages = pd.to_numeric(age_digits, errors='coerce').fillna(0).astype(int).to_numpy()
+            # 缺失值的编码为-1，正好取到末尾追加的0
+            self.data['age_numeric'] = np.append(ages, 0)[codes]
         
         # 清理行业数据
         if 'industry' in self.data.columns:
-            self.data['industry_clean'] = self.data['industry'].apply(self._clean_industry)
+            self.data['industry_clean'] = self._clean_text_column(self.data['industry'])
             
         # 清理地区数据 - 使用总部或常住地
-        if 'headquarters' in self.data.columns:
-            self.data['location_clean'] = self.data['headquarters'].apply(self._clean_location)
-        elif 'permanent_place' in self.data.columns:
-            self.data['location_clean'] = self.data['permanent_place'].apply(self._clean_location)
-        elif 'birth_place' in self.data.columns:
-            self.data['location_clean'] = self.data['birth_place'].apply(self._clean_location)
+        location_column = self._location_source_column()
+        if location_column:
+            self.data['location_clean'] = self._clean_text_column(self.data[location_column])
+        
+        if self.downcast:
+            self._downcast_columns()
+    
+    def _downcast_columns(self, category_ratio: float = 0.5) -> None:
+        for column in self.data.columns:
+            series = self.data[column]
+            if pd.api.types.is_bool_dtype(series):
+                continue
+            if pd.api.types.is_integer_dtype(series):
+                # 年龄、排名等整数列通常 int8/int16 即可容纳
+                self.data[column] = pd.to_numeric(series, downcast='integer')
+            elif pd.api.types.is_float_dtype(series):
+                self.data[column] = pd.to_numeric(series, downcast='float')
+            elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+                # 唯一值占比低的文本列（行业、性别、学历等）转为分类类型，姓名等高基数列保持不变
+                if series.nunique(dropna=False) <= category_ratio * len(series):
+                    self.data[column] = series.astype('category')
+    
+    def _location_source_column(self):
+        for column in ['headquarters', 'permanent_place', 'birth_place']:
+            if column in self.data.columns:
+                return column
+        return None
+    
+    def _clean_text_column(self, column: pd.Series) -> pd.Series:
+        # 去除首尾空白，缺失值记为“未知”；取值重复度高，只清洗唯一值再按编码映射回整列，结果为分类类型
+        codes, uniques = pd.factorize(column)
+        cleaned = pd.Series(uniques).astype('string').str.strip().tolist() + ['未知']
+        cleaned_codes, categories = pd.factorize(pd.Series(cleaned, dtype='string'), sort=True)
+        cleaned_column = pd.Series(
+            pd.Categorical.from_codes(cleaned_codes[codes], categories=categories),
+            index=column.index, name=column.name
+        )
+        return cleaned_column.cat.remove_unused_categories()
+    
+    def _clean_data_rowwise(self) -> None:
+        # 逐行 apply 的旧实现，仅保留用于基准对比
+        if self.data.empty:
+            return
+        
+        if 'wealth' in self.data.columns:
+            self.data['wealth_numeric'] = pd.to_numeric(self.data['wealth'], errors='coerce').fillna(0)
+        
+        if 'age' in self.data.columns:
+            self.data['age_numeric'] = self.data['age'].apply(self._extract_age_value)
+        
+        if 'industry' in self.data.columns:
+            self.data['industry_clean'] = self.data['industry'].apply(self._clean_industry)
+        
+        location_column = self._location_source_column()
+        if location_column:
+            self.data['location_clean'] = self.data[location_column].apply(self._clean_location)
     
     def _extract_wealth_value(self, wealth_str: str) -> float:
         if pd.isna(wealth_str):
@@ -61,30 +150,43 @@ class DataAnalyzer:
             return "未知"
         return str(location_str).strip()
     
-    def analyze_industry(self) -> Dict:
-        if 'industry_clean' not in self.data.columns:
-            return {}
+    def _grouped_wealth_stats(self, column: str) -> pd.DataFrame:
+        # 每个维度只做一次分组聚合，同时得到数量、财富总和与均值；结果缓存供各项分析复用
+        if column not in self._group_stats:
+            grouped = self.year_data.groupby(column, observed=True, sort=False)
+            if 'wealth_numeric' in self.data.columns:
+                stats = grouped['wealth_numeric'].agg(['sum', 'mean', 'count'])
+            else:
+                stats = grouped.size().to_frame('count')
+            self._group_stats[column] = stats
+        return self._group_stats[column]
+    
+    def _dimension_analysis(self, column: str, prefix: str) -> Dict:
+        stats = self._grouped_wealth_stats(column)
         
-
-        industry_count = self.data['industry_clean'].value_counts()
+        # 数量分布即聚合结果中的 count，按数量降序排列，与 value_counts 一致
+        counts = stats['count'].sort_values(ascending=False, kind='stable')
         
-
-        industry_wealth = {}
-        if 'wealth_numeric' in self.data.columns:
-            industry_wealth = self.data.groupby('industry_clean')['wealth_numeric'].agg([
-                'sum', 'mean', 'count'
-            ]).round(2)
+        wealth = {}
+        if 'sum' in stats.columns:
+            wealth = stats.sort_index().round(2).to_dict()
         
         return {
-            'industry_count': industry_count.to_dict(),
-            'industry_wealth': industry_wealth.to_dict() if hasattr(industry_wealth, 'to_dict') else {}
+            f'{prefix}_count': counts.to_dict(),
+            f'{prefix}_wealth': wealth
         }
     
+    def analyze_industry(self) -> Dict:
+        if 'industry_clean' not in self.data.columns:
+            return {}
+        
+        return self._dimension_analysis('industry_clean', 'industry')
+    
     def analyze_age_distribution(self) -> Dict:
         if 'age_numeric' not in self.data.columns:
             return {}
         
-        valid_ages = self.data[self.data['age_numeric'] > 0]['age_numeric']
+        valid_ages = self.year_data[self.year_data['age_numeric'] > 0]['age_numeric']
         
         if valid_ages.empty:
             return {}
@@ -111,44 +213,19 @@ class DataAnalyzer:
         if 'gender' not in self.data.columns:
             return {}
         
-        gender_count = self.data['gender'].value_counts()
-        
-        # 计算性别与财富的关系
-        gender_wealth = {}
-        if 'wealth_numeric' in self.data.columns:
-            gender_wealth = self.data.groupby('gender')['wealth_numeric'].agg([
-                'sum', 'mean', 'count'
-            ]).round(2)
-        
-        return {
-            'gender_count': gender_count.to_dict(),
-            'gender_wealth': gender_wealth.to_dict() if hasattr(gender_wealth, 'to_dict') else {}
-        }
+        return self._dimension_analysis('gender', 'gender')
     
     def analyze_location_distribution(self) -> Dict:
         if 'location_clean' not in self.data.columns:
             return {}
         
-        # 统计各地区富豪数量
-        location_count = self.data['location_clean'].value_counts()
-        
-        # 统计各地区财富总值
-        location_wealth = {}
-        if 'wealth_numeric' in self.data.columns:
-            location_wealth = self.data.groupby('location_clean')['wealth_numeric'].agg([
-                'sum', 'mean', 'count'
-            ]).round(2)
-        
-        return {
-            'location_count': location_count.to_dict(),
-            'location_wealth': location_wealth.to_dict() if hasattr(location_wealth, 'to_dict') else {}
-        }
+        return self._dimension_analysis('location_clean', 'location')
     
     def analyze_wealth_distribution(self) -> Dict:
         if 'wealth_numeric' not in self.data.columns:
             return {}
         
-        valid_wealth = self.data[self.data['wealth_numeric'] > 0]['wealth_numeric']
+        valid_wealth = self.year_data[self.year_data['wealth_numeric'] > 0]['wealth_numeric']
         
         if valid_wealth.empty:
             return {}
@@ -172,12 +249,86 @@ class DataAnalyzer:
             }
         }
     
+    def analyze_inequality(self, min_group_size: int = 5, lorenz_groups: int = 5) -> Dict:
+        # 基尼系数、前1%/前10%财富占比、赫芬达尔指数（整体及按行业、地区），以及洛伦兹曲线
+        # min_group_size：人数过少的组指标没有意义，不输出
+        if 'wealth_numeric' not in self.data.columns or self.year_data.empty:
+            return {}
+        
+        wealth = self.year_data['wealth_numeric'].to_numpy(dtype='float64')
+        overall = inequality_by_group(wealth)
+        if overall.empty:
+            return {}
+        
+        population, share = lorenz_curve(wealth)
+        result = {
+            'overall': stats_to_dict(overall.iloc[0]),
+            'lorenz': {'全部': {'population': population.round(4).tolist(), 'wealth': share.round(4).tolist()}},
+        }
+        
+        for column, prefix in [('industry_clean', 'industry'), ('location_clean', 'location')]:
+            if column not in self.data.columns:
+                continue
+            codes, uniques = pd.factorize(self.year_data[column])
+            stats = inequality_by_group(wealth, codes)
+            result[f'{prefix}_concentration'] = round(concentration_index(stats['total'].to_numpy()), 4)
+            
+            stats = stats[stats['count'] >= min_group_size].sort_values('total', ascending=False, kind='stable')
+            result[f'{prefix}_inequality'] = {
+                uniques[code]: stats_to_dict(row) for code, row in stats.iterrows()
+            }
+            
+            # 财富总量最大的几个行业单独画洛伦兹曲线
+            if prefix == 'industry':
+                for code in stats.index[:lorenz_groups]:
+                    population, share = lorenz_curve(wealth[codes == code])
+                    result['lorenz'][uniques[code]] = {
+                        'population': population.round(4).tolist(),
+                        'wealth': share.round(4).tolist(),
+                    }
+        
+        return result
+    
+    def ranking_index(self, column: str = 'wealth_numeric') -> RankingIndex:
+        # 每列只排序一次，之后的前 N 名、名次、百分位查询复用同一个索引；按行业、地区分组的索引在首次查询时建立
+        if column not in self._ranking_indexes:
+            if column == 'age_numeric':
+                # 年龄越小越靠前，未知年龄（0）不参与排序
+                self._ranking_indexes[column] = RankingIndex(self.year_data, column, descending=False, positive_only=True)
+            else:
+                self._ranking_indexes[column] = RankingIndex(self.year_data, column)
+        return self._ranking_indexes[column]
+    
+    def locate(self, name: str, column: str = 'wealth_numeric', within: Optional[str] = None) -> Dict:
+        # 查询某位富豪的名次；within 为分组列（如 industry_clean / location_clean）时给出组内名次
+        if 'name' not in self.data.columns or column not in self.data.columns:
+            return {}
+        if self._name_positions is None:
+            # 姓名 -> 首次出现的行号，重名时取排名靠前的一位
+            names = self.year_data['name'].to_numpy()
+            self._name_positions = dict(zip(names[::-1], range(len(names) - 1, -1, -1)))
+        position = self._name_positions.get(name)
+        if position is None:
+            return {}
+        
+        index = self.ranking_index(column)
+        group = self.year_data[within].iat[position] if within else None
+        value = self.year_data[column].iat[position].item()
+        return {
+            'name': name,
+            column: value,
+            'group': group,
+            'rank': index.rank_of(value, within, group),
+            'total': index.size(within, group),
+            'percentile': round(index.percentile(value, within, group), 2),
+        }
+    
     def get_top_lists(self, top_n: int = 10) -> Dict:
         result = {}
         
         # 财富榜前N
         if 'wealth_numeric' in self.data.columns:
-            top_wealth = self.data.nlargest(top_n, 'wealth_numeric')[
+            top_wealth = self.ranking_index('wealth_numeric').top_n(top_n)[
                 ['name', 'wealth_numeric', 'industry_clean', 'location_clean'] if all(col in self.data.columns for col in ['name', 'wealth_numeric', 'industry_clean', 'location_clean'])
                 else [col for col in ['name', 'wealth_numeric'] if col in self.data.columns]
             ]
@@ -185,7 +336,7 @@ class DataAnalyzer:
         
         # 最年轻富豪前N
         if 'age_numeric' in self.data.columns:
-            youngest = self.data[self.data['age_numeric'] > 0].nsmallest(top_n, 'age_numeric')[
+            youngest = self.ranking_index('age_numeric').top_n(top_n)[
                 ['name', 'age_numeric', 'wealth_numeric', 'industry_clean'] if all(col in self.data.columns for col in ['name', 'age_numeric', 'wealth_numeric', 'industry_clean'])
                 else [col for col in ['name', 'age_numeric'] if col in self.data.columns]
             ]
@@ -193,18 +344,85 @@ class DataAnalyzer:
         
         return result
     
-    def save_cleaned_data(self, filename: str = "hurun_cleaned_data.csv") -> None:
+    def _yearly_frames(self, key_columns: List[str]) -> Dict:
+        # 每个年份一张以 姓名+公司 为索引的表，后续按索引对齐，不逐人查找
+        value_columns = [col for col in ['wealth_numeric', 'ranking'] if col in self.data.columns]
+        frame = self.data[['year'] + key_columns + value_columns].drop_duplicates(['year'] + key_columns)
+        return {
+            year: part.set_index(key_columns)[value_columns]
+            for year, part in frame.groupby('year', sort=True, observed=True)
+        }
+    
+    def year_over_year_deltas(self, key_columns: Optional[List[str]] = None) -> pd.DataFrame:
+        # 相邻年份做一次索引 join，得到每位富豪的财富变化和排名变化（rank_delta 为正表示排名上升）
+        key_columns = key_columns or ['name', 'company']
+        if 'year' not in self.data.columns or not all(col in self.data.columns for col in key_columns):
+            return pd.DataFrame()
+        
+        by_year = self._yearly_frames(key_columns)
+        years = sorted(by_year)
+        deltas = []
+        for prev_year, year in zip(years, years[1:]):
+            joined = by_year[year].join(by_year[prev_year], how='left', rsuffix='_prev')
+            if 'wealth_numeric' in joined.columns:
+                joined['wealth_delta'] = joined['wealth_numeric'] - joined['wealth_numeric_prev']
+                joined['wealth_delta_pct'] = joined['wealth_delta'] / joined['wealth_numeric_prev'].replace(0, np.nan) * 100
+            if 'ranking' in joined.columns:
+                joined['rank_delta'] = joined['ranking_prev'] - joined['ranking']
+            joined.insert(0, 'prev_year', prev_year)
+            joined.insert(0, 'year', year)
+            deltas.append(joined.reset_index())
+        
+        return pd.concat(deltas, ignore_index=True) if deltas else pd.DataFrame()
+    
+    def analyze_year_over_year(self, top_n: int = 10) -> Dict:
+        deltas = self.year_over_year_deltas()
+        if deltas.empty:
+            return {}
+        
+        by_year = self._yearly_frames(['name', 'company'])
+        result = {}
+        for (year, prev_year), part in deltas.groupby(['year', 'prev_year'], sort=True):
+            matched = part.dropna(subset=['wealth_numeric_prev'])
+            dropped = by_year[prev_year].index.difference(by_year[year].index)
+            summary = {
+                'matched_count': len(matched),
+                'new_count': len(part) - len(matched),
+                'dropped_count': len(dropped),
+            }
+            if 'wealth_delta' in matched.columns:
+                columns = [col for col in ['name', 'company', 'wealth_numeric', 'wealth_delta', 'wealth_delta_pct']
+                           if col in matched.columns]
+                summary['top_gainers'] = matched.nlargest(top_n, 'wealth_delta')[columns].round(2).to_dict('records')
+                summary['top_losers'] = matched.nsmallest(top_n, 'wealth_delta')[columns].round(2).to_dict('records')
+            if 'rank_delta' in matched.columns:
+                columns = [col for col in ['name', 'company', 'ranking', 'rank_delta'] if col in matched.columns]
+                summary['top_risers'] = matched.nlargest(top_n, 'rank_delta')[columns].to_dict('records')
+            result[f"{prev_year}-{year}"] = summary
+        
+        return result
+    
+    def save_cleaned_data(self, filename: str = "hurun_cleaned_data.csv", fmt: Optional[str] = None) -> None:
+        # fmt 为空时按后缀选择存储格式；parquet / feather 会保留数值与分类类型
         if self.data.empty:
             print("没有数据可保存")
             return
             
-        self.data.to_csv(filename, index=False, encoding='utf-8-sig')
+        save_frame(self.data, filename, fmt)
         print(f"清洗后数据已保存到 {filename}")
     
+    @classmethod
+    def load_cleaned_data(cls, filename: str, columns: Optional[List[str]] = None,
+                          fmt: Optional[str] = None, **kwargs) -> 'DataAnalyzer':
+        # 从已保存的数据文件直接构建分析器，columns 可只读取分析需要的列
+        data = load_frame(filename, columns=columns, fmt=fmt)
+        print(f"已从 {filename} 读取 {len(data)} 条数据")
+        return cls(data, **kwargs)
+    
     def comprehensive_analysis(self) -> Dict:
-        return {
+        results = {
             'basic_stats': {
-                'total_count': len(self.data),
+                'total_count': len(self.year_data),
                 'columns': list(self.data.columns)
             },
             'industry_analysis': self.analyze_industry(),
@@ -212,5 +430,12 @@ class DataAnalyzer:
             'gender_analysis': self.analyze_gender_distribution(),
             'location_analysis': self.analyze_location_distribution(),
             'wealth_analysis': self.analyze_wealth_distribution(),
-            'top_lists': self.get_top_lists()
-        } 
\ No newline at end of file
+            'top_lists': self.get_top_lists(),
+            'inequality_analysis': self.analyze_inequality()
+        }
+        
+        # 多年份数据额外给出年度变化
+        year_over_year = self.analyze_year_over_year()
+        if year_over_year:
+            results['year_over_year'] = year_over_year
+        return results 
\ No newline at end of file
@@ -1,13 +1,104 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import os
 import pandas as pd
 from typing import List, Dict, Optional
+from .rate_limiter import TokenBucket
+from .checkpoint import CrawlCheckpoint
+from .storage import save_frame, save_partitioned
+from common.http_cache import HttpCache
+
+
+# 榜单字段映射：原始字段 -> (输出列名, 缺省值)
+RICH_FIELDS = {
+    'hs_Rank_Rich_Ranking': ('ranking', 0),
+    'hs_Rank_Rich_ChaName_Cn': ('name', '未知'),
+    'hs_Rank_Rich_Wealth': ('wealth', 0),
+    'hs_Rank_Rich_Wealth_Change': ('wealth_change', '0%'),
+    'hs_Rank_Rich_Ranking_Change': ('ranking_change', '0'),
+    'hs_Rank_Rich_ComName_Cn': ('company', '未知'),
+    'hs_Rank_Rich_ComName_En': ('company_en', ''),
+    'hs_Rank_Rich_ComHeadquarters_Cn': ('headquarters', '未知'),
+    'hs_Rank_Rich_Industry_Cn': ('industry', '未知'),
+    'hs_Rank_Rich_Industry_En': ('industry_en', ''),
+    'hs_Rank_Rich_Relations': ('relations', '未知'),
+}
+
+# 人物字段映射，取自 hs_Character 列表的第一个元素
+CHARACTER_FIELDS = {
+    'hs_Character_Gender': ('gender', '未知'),
+    'hs_Character_Age': ('age', '未知'),
+    'hs_Character_Birthday': ('birthday', ''),
+    'hs_Character_Nationality': ('nationality', ''),
+    'hs_Character_BirthPlace_Cn': ('birth_place', '未知'),
+    'hs_Character_Permanent_Cn': ('permanent_place', '未知'),
+    'hs_Character_Education_Cn': ('education', '未知'),
+    'hs_Character_School_Cn': ('school', '未知'),
+    'hs_Character_NativePlace_Cn': ('native_place', '未知'),
+}
+
+NUMERIC_COLUMNS = {'ranking': 'int64', 'wealth': 'float64'}
+
+HURUN_API_URL = "https://www.hurun.net/zh-CN/Rank/HsRankDetailsList"
+
+# 已知的榜单编号：年份 -> 接口的 num 参数，其他年份的编号可在胡润官网榜单页的请求中查到
+HURUN_RANKINGS = {
+    2024: "ODBYW2BI",
+}
+
+
+def _missing_keys(records: List[Dict], fields: Dict) -> pd.DataFrame:
+    # 标记原始记录中没有该字段的位置（字段存在但值为 null 时不算缺失）
+    return pd.DataFrame({name: [key not in record for record in records] for key, (name, _) in fields.items()})
+
+
+def normalize_rows(rows: List[Dict]) -> pd.DataFrame:
+    # 一次性把整页（或整次采集）的原始 JSON 行展开为带类型的 DataFrame
+    # 与 _process_data_item 一致：只为缺少的字段填充缺省值，接口显式返回的 null 保留为空值
+    columns = [name for name, _ in RICH_FIELDS.values()] + [name for name, _ in CHARACTER_FIELDS.values()]
+    if not rows:
+        return pd.DataFrame(columns=columns)
+    
+    # 按显式字段映射直接投影需要的列，比 json_normalize 展开全部字段快得多
+    raw = pd.DataFrame(rows, columns=list(RICH_FIELDS) + ['hs_Character'])
+    rich = raw[list(RICH_FIELDS)]
+    rich.columns = [name for name, _ in RICH_FIELDS.values()]
+    
+    # 没有人物信息时所有人物字段都视为缺失
+    first_chars = [chars[0] if isinstance(chars, list) and chars else {} for chars in raw['hs_Character']]
+    character = pd.DataFrame(first_chars, columns=list(CHARACTER_FIELDS), index=rich.index)
+    character.columns = [name for name, _ in CHARACTER_FIELDS.values()]
+    
+    frame = pd.concat([rich, character], axis=1)
+    missing = pd.concat([_missing_keys(rows, RICH_FIELDS), _missing_keys(first_chars, CHARACTER_FIELDS)], axis=1)
+    missing.index = frame.index
+    defaults = dict(RICH_FIELDS.values())
+    defaults.update(CHARACTER_FIELDS.values())
+    
+    for column, dtype in NUMERIC_COLUMNS.items():
+        values = pd.to_numeric(frame[column], errors='coerce').mask(missing[column], defaults[column])
+        # 有空值时保持浮点类型，与逐条处理的结果一致
+        frame[column] = values.astype(dtype) if values.notna().all() else values.astype('float64')
+    
+    # 只对确实缺少字段的列填充缺省值
+    for column in missing.columns[missing.any()]:
+        if column not in NUMERIC_COLUMNS:
+            frame[column] = frame[column].mask(missing[column], defaults[column])
+    return frame
 
 
 class DataCollector:
     
-    def __init__(self):
-        self.base_url = "https://www.hurun.net/zh-CN/Rank/HsRankDetailsList"
+    def __init__(self, pool_size: int = 10, max_retries: int = 3, backoff_factor: float = 0.5,
+                 cache: Optional[HttpCache] = None, base_url: Optional[str] = None,
+                 list_id: Optional[str] = None):
+        # base_url 可指向本地回放服务（见 replay.py），离线压测时不访问胡润官网
+        self.base_url = base_url or HURUN_API_URL
+        self.list_id = list_id or HURUN_RANKINGS[2024]  # 榜单编号
         self.headers = {
             "accept": "application/json, text/javascript, */*; q=0.01",
             "accept-language": "zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6",
@@ -35,64 +126,220 @@ class DataCollector:
             "Hm_lpvt_2b09927a5895e3946dc6de8526befc81": "1752046421",
             "__utmb": "245691549.3.10.1752046257"
         }
-        self.data = []
+        self.session = self._create_session(pool_size, max_retries, backoff_factor)
+        self.cache = cache  # 可选的磁盘 HTTP 缓存，命中时不访问网络
+        self.raw_rows = []  # 采集到的原始 JSON 行，统一在 get_data_frame 中批量展开
+        self._frame = None
+        self._records = None
+        self.page_latency = {}  # offset -> 单页请求耗时（秒）
+        self.checkpoint = None
+        self._incomplete = False  # 本次采集是否有页请求失败
+        self.rankings_frame = None  # collect_rankings 采集的多年份数据
         
+    def _create_session(self, pool_size: int, max_retries: int, backoff_factor: float) -> requests.Session:
+        # 所有分页请求共用一个保持长连接的会话，请求头和 cookie 只设置一次
+        session = requests.Session()
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,  # 第 n 次重试前等待 backoff_factor * 2^(n-1) 秒
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+            respect_retry_after_header=True
+        )
+        # 连接池大小应不小于并发采集的线程数
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(self.headers)
+        session.cookies.update(self.cookies)
+        return session
+    
     def collect_page_data(self, offset: int = 0, limit: int = 20) -> Optional[Dict]:
         params = {
-            "num": "ODBYW2BI",  # 固定参数
+            "num": self.list_id,
             "search": "",
             "offset": str(offset),
             "limit": str(limit)
         }
         
         try:
-            response = requests.get(
-                self.base_url, 
-                headers=self.headers, 
-                cookies=self.cookies, 
-                params=params,
-                timeout=10
-            )
+            if self.cache is not None:
+                response = self.cache.get(self.base_url, params=params, session=self.session, timeout=10)
+            else:
+                response = self.session.get(self.base_url, params=params, timeout=10)
             response.raise_for_status()
             return response.json()
         except Exception as e:
             print(f"数据采集失败: {e}")
             return None
     
-    def collect_all_data(self, max_pages: int = 50) -> List[Dict]:
+    def collect_all_data(self, max_pages: int = 50, concurrent: bool = False,
+                         max_workers: int = 4, rate_limit: float = 1.0,
+                         checkpoint_file: Optional[str] = None,
+                         limiter: Optional[TokenBucket] = None,
+                         fresh: bool = False) -> List[Dict]:
+        # 返回处理后的记录列表（同 self.data），原始 JSON 行保存在 self.raw_rows 中
+        # rate_limit：每秒允许发出的请求数，由令牌桶统一控制，替代固定的 sleep
+        # checkpoint_file：断点日志路径，中断后重新运行时已写入日志的页直接复用，不再发请求；
+        #     完整采集后删除日志，之后的运行会重新请求最新数据
+        # limiter：与其他采集器共用的令牌桶，指定时忽略 rate_limit
+        # fresh：丢弃已有的断点日志，全部重新采集
+        self._incomplete = False
+        if checkpoint_file:
+            self.checkpoint = CrawlCheckpoint(checkpoint_file, self.list_id, fresh=fresh)
+        
+        if concurrent:
+            limiter = limiter or TokenBucket(rate_limit, capacity=max_workers)
+            self._collect_concurrently(max_pages, max_workers, limiter)
+        else:
+            limiter = limiter or TokenBucket(rate_limit, capacity=1)
+            self._collect_serially(max_pages, limiter)
+            
+        print(f"数据采集完成，共采集 {len(self.raw_rows)} 条数据")
+        self._report_latency()
+        
+        if self.checkpoint is not None:
+            if self._incomplete:
+                print(f"部分页采集失败，断点日志保留在 {self.checkpoint.path}，重新运行可继续采集")
+            else:
+                # 已完整采集，删除断点日志，避免之后的运行一直复用旧数据
+                self.checkpoint.clear()
+        return self.data
+    
+    def collect_rankings(self, rankings: Dict[int, str], max_pages: int = 50,
+                         max_workers: Optional[int] = None, rate_limit: float = 1.0,
+                         checkpoint_file: Optional[str] = None, fresh: bool = False) -> pd.DataFrame:
+        # rankings：年份 -> 榜单编号。各年份榜单并发采集，每个榜单内部按页串行翻页，
+        # 所有请求共用同一个会话和令牌桶，总请求速率仍由 rate_limit 控制
+        limiter = TokenBucket(rate_limit, capacity=max(len(rankings), 1))
+        collectors = {year: self._spawn(list_id) for year, list_id in rankings.items()}
+        
+        def collect(year: int) -> None:
+            # 每个榜单使用独立的断点日志，避免多个线程追加写同一个文件
+            year_checkpoint = None
+            if checkpoint_file:
+                root, ext = os.path.splitext(checkpoint_file)
+                year_checkpoint = f"{root}_{year}{ext}"
+            collectors[year].collect_all_data(max_pages=max_pages, checkpoint_file=year_checkpoint,
+                                              limiter=limiter, fresh=fresh)
+        
+        with ThreadPoolExecutor(max_workers=max_workers or max(len(rankings), 1)) as executor:
+            list(executor.map(collect, collectors))
+        
+        frames = []
+        for year in sorted(collectors):
+            frame = collectors[year].get_data_frame()
+            if frame.empty:
+                print(f"{year} 年榜单（{rankings[year]}）未采集到数据")
+                continue
+            frame = frame.copy()
+            frame.insert(0, 'year', year)
+            frames.append(frame)
+        
+        self.rankings_frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        print(f"共采集 {len(frames)} 个年份的榜单，合计 {len(self.rankings_frame)} 条数据")
+        return self.rankings_frame
+    
+    def _spawn(self, list_id: str) -> 'DataCollector':
+        # 子采集器共用当前的会话（连接池）和缓存，只替换榜单编号
+        collector = DataCollector(cache=self.cache, base_url=self.base_url, list_id=list_id)
+        collector.session.close()
+        collector.session = self.session
+        return collector
+    
+    def save_rankings(self, root_dir: str = "hurun_rankings", fmt: str = 'csv') -> List[str]:
+        # 按年份分区保存：root_dir/year=2024/part.csv，可用 storage.load_partitioned 读回
+        if self.rankings_frame is None or self.rankings_frame.empty:
+            print("没有数据可保存")
+            return []
+        
+        paths = save_partitioned(self.rankings_frame, root_dir, ['year'], fmt)
+        print(f"多年份数据已保存到 {root_dir}（{len(paths)} 个分区）")
+        return paths
+    
+    def _collect_serially(self, max_pages: int, limiter: TokenBucket) -> None:
         offset = 0
         limit = 20
         page_count = 0
         
         while page_count < max_pages:
-            page_data = self.collect_page_data(offset, limit)
-            if not page_data or not page_data.get('rows'):
-                break
-                
-            data_list = page_data['rows']
-            if not data_list:
-                break
-                
-
-            processed_data = []
-            for item in data_list:
-                processed_item = self._process_data_item(item)
-                if processed_item:
-                    processed_data.append(processed_item)
-            
-            self.data.extend(processed_data)
-            print(f"已采集第 {page_count + 1} 页，累计 {len(self.data)} 条数据")
-            
-
-            if len(data_list) < limit:
+            page_data = self._fetch_page_timed(offset, limit, limiter)
+            if not self._handle_page(page_data, page_count, limit):
                 break
                 
             offset += limit
             page_count += 1
-            time.sleep(1)  # 防止请求过快
+    
+    def _collect_concurrently(self, max_pages: int, max_workers: int, limiter: TokenBucket) -> None:
+        limit = 20
+        next_page = 0
+        pending = deque()
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # 同时在途的页数不超过 max_workers，按页序依次取结果，保证排名顺序
+            while next_page < max_pages and len(pending) < max_workers:
+                pending.append((next_page, executor.submit(self._fetch_page_timed, next_page * limit, limit, limiter)))
+                next_page += 1
             
-        print(f"数据采集完成，共采集 {len(self.data)} 条数据")
-        return self.data
+            while pending:
+                page_index, future = pending.popleft()
+                if not self._handle_page(future.result(), page_index, limit):
+                    # 已经到达最后一页，取消尚未开始的请求
+                    for _, rest in pending:
+                        rest.cancel()
+                    break
+                
+                if next_page < max_pages:
+                    pending.append((next_page, executor.submit(self._fetch_page_timed, next_page * limit, limit, limiter)))
+                    next_page += 1
+    
+    def _fetch_page_timed(self, offset: int, limit: int, limiter: TokenBucket) -> Optional[Dict]:
+        if self.checkpoint is not None:
+            rows = self.checkpoint.get(offset)
+            if rows is not None:
+                return {'rows': rows}
+        
+        limiter.acquire()
+        start = time.perf_counter()
+        page_data = self.collect_page_data(offset, limit)
+        self.page_latency[offset] = time.perf_counter() - start
+        return page_data
+    
+    def _handle_page(self, page_data: Optional[Dict], page_index: int, limit: int) -> bool:
+        # 处理一页数据，返回是否还需要继续采集下一页
+        if not page_data:
+            # 请求失败，本次采集不完整
+            self._incomplete = True
+            return False
+        if not page_data.get('rows'):
+            return False
+            
+        data_list = page_data['rows']
+        offset = page_index * limit
+        if self.checkpoint is not None:
+            self.checkpoint.commit(offset, data_list)
+        
+        self.raw_rows.extend(data_list)
+        self._frame = None
+        self._records = None
+        if offset in self.page_latency:
+            source = f"耗时 {self.page_latency[offset] * 1000:.0f} ms"
+        else:
+            source = "来自断点"
+        print(f"已采集第 {page_index + 1} 页，累计 {len(self.raw_rows)} 条数据（{source}）")
+        
+        # 不足一页说明已经是最后一页
+        return len(data_list) >= limit
+    
+    def _report_latency(self) -> None:
+        if not self.page_latency:
+            return
+        
+        latencies = sorted(self.page_latency.values())
+        count = len(latencies)
+        print(f"单页请求耗时：平均 {sum(latencies) / count * 1000:.0f} ms，"
+              f"中位数 {latencies[count // 2] * 1000:.0f} ms，"
+              f"最大 {latencies[-1] * 1000:.0f} ms（共 {count} 次请求）")
     
     def _process_data_item(self, item: Dict) -> Optional[Dict]:
         try:
@@ -146,14 +393,35 @@ class DataCollector:
             print(f"处理数据项时出错: {e}")
             return None
     
+    @property
+    def data(self) -> List[Dict]:
+        # 兼容旧接口：处理后的记录列表，只在数据变化后的首次访问时生成
+        if self._records is None:
+            self._records = self.get_data_frame().to_dict('records')
+        return self._records
+    
     def save_to_csv(self, filename: str = "hurun_data.csv") -> None:
-        if not self.data:
+        self.save_data(filename, fmt='csv')
+    
+    def save_data(self, filename: str, fmt: Optional[str] = None) -> None:
+        # fmt 为空时按后缀选择存储格式：.csv / .parquet / .feather
+        if not self.raw_rows:
             print("没有数据可保存")
             return
             
-        df = pd.DataFrame(self.data)
-        df.to_csv(filename, index=False, encoding='utf-8-sig')
+        save_frame(self.get_data_frame(), filename, fmt)
         print(f"数据已保存到 {filename}")
     
     def get_data_frame(self) -> pd.DataFrame:
-        return pd.DataFrame(self.data) if self.data else pd.DataFrame() 
\ No newline at end of file
+        if not self.raw_rows:
+            return pd.DataFrame()
+        
+        if self._frame is None:
+            try:
+                self._frame = normalize_rows(self.raw_rows)
+            except Exception as e:
+                # 批量展开失败时退回逐条处理
+                print(f"批量处理数据失败，改为逐条处理: {e}")
+                processed = [self._process_data_item(item) for item in self.raw_rows]
+                self._frame = pd.DataFrame([item for item in processed if item])
+        return self._frame 
\ No newline at end of file
@@ -1,25 +1,99 @@
+import matplotlib
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 from typing import Dict, List, Optional
 import os
+import time
+import functools
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
 from .font_helper import setup_chinese_font
+from common.chart_manifest import ChartManifest
+
+# 图表样式参数，变更后所有图表都会重新渲染
+CHART_STYLE = {
+    'style': 'whitegrid',
+    'palette': 'husl',
+    'dpi': 300,
+}
 
 # 设置seaborn样式
-sns.set_style("whitegrid")
-sns.set_palette("husl")
+sns.set_style(CHART_STYLE['style'])
+sns.set_palette(CHART_STYLE['palette'])
+
+# 仪表盘中的图表，按输出顺序排列：(分析结果中的键, 绘图方法名)
+DASHBOARD_CHARTS = [
+    ('industry_analysis', 'plot_industry_distribution'),
+    ('wealth_analysis', 'plot_wealth_distribution'),
+    ('age_analysis', 'plot_age_distribution'),
+    ('location_analysis', 'plot_location_heatmap'),
+    ('gender_analysis', 'plot_gender_distribution'),
+    ('inequality_analysis', 'plot_lorenz_curves'),
+]
+
+
+def _init_render_worker() -> None:
+    # matplotlib 不是线程安全的，并行渲染放在子进程中，并使用非交互的 Agg 后端
+    matplotlib.use('Agg')
+
+
+def _render_chart(output_dir: str, method_name: str, data: Dict):
+    # 并行渲染时在子进程中执行；是否需要渲染已由调用方根据清单判断，这里直接渲染
+    start = time.perf_counter()
+    path = getattr(DataVisualizer(output_dir, incremental=False), method_name)(data)
+    return path, time.perf_counter() - start
+
+
+def incremental_chart(default_filename: str):
+    # 图表输入和样式的哈希与清单记录一致且图片仍在时，跳过渲染直接返回已有图片
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, data: Dict, save_path: Optional[str] = None) -> str:
+            if not save_path:
+                save_path = os.path.join(self.output_dir, default_filename)
+            if not self.incremental:
+                with self.stage(method.__name__):
+                    return method(self, data, save_path)
+            
+            chart_key = self.chart_key(method.__name__, data)
+            if self.manifest.is_fresh(save_path, chart_key):
+                print(f"{os.path.basename(save_path)} 输入未变化，跳过渲染")
+                return save_path
+            
+            with self.stage(method.__name__):
+                path = method(self, data, save_path)
+            if path:
+                self.manifest.record(path, chart_key)
+            return path
+        
+        wrapper.default_filename = default_filename
+        return wrapper
+    return decorator
 
 
 class DataVisualizer:
     
-    def __init__(self, output_dir: str = "charts"):
+    def __init__(self, output_dir: str = "charts", incremental: bool = True, profiler=None):
+        # incremental=True 时输入未变化的图表不重新渲染，哈希清单保存在图表目录中
+        # profiler 为 StageProfiler 时每张图表的渲染记录为一个阶段
         self.output_dir = output_dir
+        self.incremental = incremental
+        self.profiler = profiler
         self.ensure_output_dir()
+        self.manifest = ChartManifest(output_dir)
         
     def ensure_output_dir(self) -> None:
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
     
+    def stage(self, name: str):
+        return self.profiler.stage(name) if self.profiler else contextlib.nullcontext()
+    
+    def chart_key(self, method_name: str, data: Dict) -> str:
+        return ChartManifest.compute_key(data, dict(CHART_STYLE, chart=method_name))
+    
+    @incremental_chart('industry_distribution.png')
     def plot_industry_distribution(self, industry_data: Dict, save_path: Optional[str] = None) -> str:
         if not industry_data.get('industry_count'):
             return ""
@@ -66,13 +140,12 @@ class DataVisualizer:
         
         plt.tight_layout()
         
-        if not save_path:
-            save_path = os.path.join(self.output_dir, 'industry_distribution.png')
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        plt.savefig(save_path, dpi=CHART_STYLE['dpi'], bbox_inches='tight')
         plt.close()
         
         return save_path
     
+    @incremental_chart('wealth_distribution.png')
     def plot_wealth_distribution(self, wealth_data: Dict, save_path: Optional[str] = None) -> str:
         if not wealth_data.get('wealth_distribution'):
             return ""
@@ -122,13 +195,12 @@ class DataVisualizer:
         
         plt.tight_layout()
         
-        if not save_path:
-            save_path = os.path.join(self.output_dir, 'wealth_distribution.png')
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        plt.savefig(save_path, dpi=CHART_STYLE['dpi'], bbox_inches='tight')
         plt.close()
         
         return save_path
     
+    @incremental_chart('age_distribution.png')
     def plot_age_distribution(self, age_data: Dict, save_path: Optional[str] = None) -> str:
         if not age_data.get('age_distribution'):
             return ""
@@ -177,13 +249,12 @@ class DataVisualizer:
         
         plt.tight_layout()
         
-        if not save_path:
-            save_path = os.path.join(self.output_dir, 'age_distribution.png')
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        plt.savefig(save_path, dpi=CHART_STYLE['dpi'], bbox_inches='tight')
         plt.close()
         
         return save_path
     
+    @incremental_chart('location_heatmap.png')
     def plot_location_heatmap(self, location_data: Dict, save_path: Optional[str] = None) -> str:
         if not location_data.get('location_count'):
             return ""
@@ -222,13 +293,12 @@ class DataVisualizer:
         
         plt.tight_layout()
         
-        if not save_path:
-            save_path = os.path.join(self.output_dir, 'location_heatmap.png')
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        plt.savefig(save_path, dpi=CHART_STYLE['dpi'], bbox_inches='tight')
         plt.close()
         
         return save_path
     
+    @incremental_chart('gender_distribution.png')
     def plot_gender_distribution(self, gender_data: Dict, save_path: Optional[str] = None) -> str:
         if not gender_data.get('gender_count'):
             return ""
@@ -271,45 +341,117 @@ class DataVisualizer:
         
         plt.tight_layout()
         
-        if not save_path:
-            save_path = os.path.join(self.output_dir, 'gender_distribution.png')
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        plt.savefig(save_path, dpi=CHART_STYLE['dpi'], bbox_inches='tight')
         plt.close()
         
         return save_path
     
-    def create_comprehensive_dashboard(self, analysis_results: Dict) -> List[str]:
-        chart_paths = []
+    @incremental_chart('lorenz_curves.png')
+    def plot_lorenz_curves(self, inequality_data: Dict, save_path: Optional[str] = None) -> str:
+        if not inequality_data.get('lorenz'):
+            return ""
         
-        # 行业分布图
-        if analysis_results.get('industry_analysis'):
-            path = self.plot_industry_distribution(analysis_results['industry_analysis'])
-            if path:
-                chart_paths.append(path)
+        # 确保中文字体设置
+        setup_chinese_font()
         
-        # 财富分布图
-        if analysis_results.get('wealth_analysis'):
-            path = self.plot_wealth_distribution(analysis_results['wealth_analysis'])
-            if path:
-                chart_paths.append(path)
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
         
-        # 年龄分布图
-        if analysis_results.get('age_analysis'):
-            path = self.plot_age_distribution(analysis_results['age_analysis'])
-            if path:
-                chart_paths.append(path)
+        # 洛伦兹曲线：整体加粗，主要行业为细线，对角线为完全平均的情况
+        ax1.plot([0, 1], [0, 1], color='gray', linestyle='--', linewidth=1, label='完全平均')
+        for label, curve in inequality_data['lorenz'].items():
+            is_overall = label == '全部'
+            ax1.plot(curve['population'], curve['wealth'],
+                     linewidth=2.5 if is_overall else 1.2,
+                     color='black' if is_overall else None,
+                     label=label)
+        overall = inequality_data.get('overall', {})
+        ax1.set_xlabel('人数累计占比')
+        ax1.set_ylabel('财富累计占比')
+        ax1.set_title(f"财富洛伦兹曲线（整体基尼系数 {overall.get('gini', 0):.3f}）")
+        ax1.set_xlim(0, 1)
+        ax1.set_ylim(0, 1)
+        ax1.legend(loc='upper left', fontsize=9)
+        
+        # 各行业基尼系数（财富总量前15的行业）
+        industry_inequality = dict(list(inequality_data.get('industry_inequality', {}).items())[:15])
+        if industry_inequality:
+            industries = list(industry_inequality.keys())
+            ginis = [stats['gini'] for stats in industry_inequality.values()]
+            
+            bars = ax2.barh(range(len(industries)), ginis, color='mediumpurple', alpha=0.8)
+            ax2.set_yticks(range(len(industries)))
+            ax2.set_yticklabels(industries)
+            ax2.invert_yaxis()
+            ax2.set_xlabel('基尼系数')
+            ax2.set_title('主要行业内部财富不平等程度（前15名）')
+            
+            for bar, gini in zip(bars, ginis):
+                ax2.text(bar.get_width() + 0.005, bar.get_y() + bar.get_height()/2.,
+                        f'{gini:.2f}', ha='left', va='center')
+        else:
+            ax2.axis('off')
         
-        # 地区热力图
-        if analysis_results.get('location_analysis'):
-            path = self.plot_location_heatmap(analysis_results['location_analysis'])
-            if path:
-                chart_paths.append(path)
+        plt.tight_layout()
+        
+        plt.savefig(save_path, dpi=CHART_STYLE['dpi'], bbox_inches='tight')
+        plt.close()
         
-        # 性别分布图
-        if analysis_results.get('gender_analysis'):
-            path = self.plot_gender_distribution(analysis_results['gender_analysis'])
+        return save_path
+    
+    def create_comprehensive_dashboard(self, analysis_results: Dict, parallel: bool = False,
+                                       max_workers: Optional[int] = None,
+                                       charts: Optional[List[str]] = None) -> List[str]:
+        # parallel=True 时每个图表在独立进程中渲染，返回的路径顺序与串行模式一致
+        # charts：只渲染这些绘图方法（如 ['plot_wealth_distribution']），为空时渲染全部
+        tasks = [(method_name, analysis_results[key]) for key, method_name in DASHBOARD_CHARTS
+                 if analysis_results.get(key) and (charts is None or method_name in charts)]
+        
+        self.render_times = {}
+        results = [None] * len(tasks)
+        pending = []
+        for index, (method_name, data) in enumerate(tasks):
+            save_path = os.path.join(self.output_dir, getattr(DataVisualizer, method_name).default_filename)
+            chart_key = self.chart_key(method_name, data)
+            if self.incremental and self.manifest.is_fresh(save_path, chart_key):
+                results[index] = (save_path, 0.0)
+                print(f"{os.path.basename(save_path)} 输入未变化，跳过渲染")
+            else:
+                pending.append((index, method_name, data, chart_key))
+        
+        if parallel and len(pending) > 1:
+            workers = max_workers or min(len(pending), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker) as executor:
+                futures = [executor.submit(_render_chart, self.output_dir, method_name, data)
+                           for _, method_name, data, _ in pending]
+                rendered = [future.result() for future in futures]
+            # 子进程中的渲染无法直接埋点，只记录各图表的耗时
+            if self.profiler:
+                for (_, method_name, _, _), (_, elapsed) in zip(pending, rendered):
+                    self.profiler.record(method_name, elapsed)
+        else:
+            # 串行时直接在当前实例上渲染，保留 profiler 等实例状态；是否需要渲染已在上面判断，调用未包装的绘图方法
+            rendered = []
+            for _, method_name, data, _ in pending:
+                wrapper = getattr(DataVisualizer, method_name)
+                save_path = os.path.join(self.output_dir, wrapper.default_filename)
+                start = time.perf_counter()
+                with self.stage(method_name):
+                    path = wrapper.__wrapped__(self, data, save_path)
+                rendered.append((path, time.perf_counter() - start))
+        
+        # 清单只在主进程中更新，避免多个子进程同时写入
+        for (index, _, _, chart_key), (path, elapsed) in zip(pending, rendered):
+            results[index] = (path, elapsed)
+            if path and self.incremental:
+                self.manifest.record(path, chart_key)
+        
+        chart_paths = []
+        for (method_name, _), (path, elapsed) in zip(tasks, results):
+            self.render_times[method_name] = elapsed
             if path:
                 chart_paths.append(path)
+                if elapsed:
+                    print(f"已生成 {os.path.basename(path)}，耗时 {elapsed:.2f} 秒")
         
         print(f"共生成 {len(chart_paths)} 个图表")
-        return chart_paths 
\ No newline at end of file
+        return chart_paths
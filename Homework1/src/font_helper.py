@@ -1,64 +1,137 @@
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 import matplotlib as mpl
+import hashlib
+import json
 import os
 import warnings
 
+# 常见的中文字体名称（按优先级排序）
+COMMON_CHINESE_FONTS = [
+    'Microsoft YaHei', 'SimHei', 'SimSun', 'KaiTi', 'FangSong',
+    'Microsoft JhengHei', 'PingFang SC', 'Heiti SC', 'STHeiti',
+    'Arial Unicode MS', 'WenQuanYi Zen Hei', 'Noto Sans CJK SC', 'Source Han Sans SC'
+]
+
+FONT_CACHE_FILE = os.path.join(mpl.get_cachedir(), 'chinese_font_cache.json')
+
+# 本进程内已解析出的中文字体，None 表示尚未解析
+_resolved_fonts = None
+
+
+def _system_font_files():
+    # 直接扫描系统字体目录，而不是 matplotlib 自己缓存的字体列表（新安装的字体不会出现在其中）
+    return fm.findSystemFonts()
+
+
+def _font_set_key(font_files):
+    # 以系统字体文件路径及修改时间作为指纹，安装、删除或替换字体后缓存自动失效
+    entries = []
+    for path in sorted(font_files):
+        try:
+            entries.append(f"{path}\t{os.stat(path).st_mtime_ns}")
+        except OSError:
+            continue
+    return hashlib.sha1('\n'.join(entries).encode('utf-8')).hexdigest()
+
+
+def _refresh_font_manager(font_files):
+    # 系统中有 matplotlib 字体列表里没有的字体时（如刚安装了中文字体），把它们加入现有的字体管理器；
+    # 渲染后端在导入时已持有 fm.fontManager 的引用，因此只能原地添加而不能替换该对象
+    known = {os.path.realpath(font.fname) for font in fm.fontManager.ttflist}
+    known.update(os.path.realpath(font.fname) for font in fm.fontManager.afmlist)
+    for path in font_files:
+        if os.path.realpath(path) in known:
+            continue
+        try:
+            fm.fontManager.addfont(path)
+        except Exception:
+            # 无法解析的字体文件直接跳过
+            continue
+
+
+def _load_cached_fonts(key):
+    try:
+        with open(FONT_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if cached.get('key') != key:
+        return None
+    # 缓存的字体文件被移除时重新查找
+    if cached.get('path') and not os.path.exists(cached['path']):
+        return None
+    return cached.get('fonts', [])
+
+
+def _save_cached_fonts(key, fonts, path):
+    try:
+        with open(FONT_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'fonts': fonts, 'path': path}, f, ensure_ascii=False)
+    except OSError:
+        pass
+
+
+def _discover_chinese_fonts():
+    available_fonts = {}
+    for font in fm.fontManager.ttflist:
+        available_fonts.setdefault(font.name, font.fname)
+
+    chinese_fonts = [name for name in COMMON_CHINESE_FONTS if name in available_fonts]
+    path = available_fonts[chinese_fonts[0]] if chinese_fonts else None
+    return chinese_fonts, path
+
+
+def _resolve_chinese_fonts():
+    # 每个进程只查找一次中文字体，结果按系统字体文件集合持久化；只有字体集合变化时才刷新 matplotlib 的字体列表
+    global _resolved_fonts
+    if _resolved_fonts is not None:
+        return _resolved_fonts
+
+    font_files = _system_font_files()
+    key = _font_set_key(font_files)
+    chinese_fonts = _load_cached_fonts(key)
+    if chinese_fonts is None:
+        # 字体集合发生变化（或首次运行），必要时刷新 matplotlib 的字体列表后重新查找
+        _refresh_font_manager(font_files)
+        chinese_fonts, path = _discover_chinese_fonts()
+        _save_cached_fonts(key, chinese_fonts, path)
+
+    if chinese_fonts:
+        print(f"已设置中文字体: {chinese_fonts[0]}")
+    else:
+        print("未找到中文字体，使用默认字体，中文可能显示为方块")
+
+    _resolved_fonts = chinese_fonts
+    return _resolved_fonts
+
+
 def setup_chinese_font():
     # 抑制字体警告
     warnings.filterwarnings('ignore', category=UserWarning, message='.*Glyph.*missing from font.*')
     warnings.filterwarnings('ignore', category=UserWarning, message='.*findfont.*')
-    
-    # 清除matplotlib字体缓存
-    try:
-        import shutil
-        cache_dir = mpl.get_cachedir()
-        font_cache = os.path.join(cache_dir, 'fontlist-v*.json')
-        import glob
-        for cache_file in glob.glob(font_cache):
-            try:
-                os.remove(cache_file)
-            except:
-                pass
-        fm._rebuild()
-    except:
-        pass
-    
-    # 检查可用的中文字体
-    available_fonts = [font.name for font in fm.fontManager.ttflist]
-    
-    # 常见的中文字体名称（按优先级排序）
-    common_chinese_fonts = [
-        'Microsoft YaHei', 'SimHei', 'SimSun', 'KaiTi', 'FangSong',
-        'Microsoft JhengHei', 'PingFang SC', 'Heiti SC', 'STHeiti',
-        'Arial Unicode MS', 'WenQuanYi Zen Hei'
-    ]
-    
-    chinese_fonts = []
-    for font_name in common_chinese_fonts:
-        if font_name in available_fonts:
-            chinese_fonts.append(font_name)
-    
+
+    chinese_fonts = _resolve_chinese_fonts()
+
     # 设置字体
     if chinese_fonts:
         # 全局设置matplotlib字体
         mpl.rcParams['font.sans-serif'] = chinese_fonts
-        mpl.rcParams['axes.unicode_minus'] = False  
+        mpl.rcParams['axes.unicode_minus'] = False
         mpl.rcParams['font.family'] = 'sans-serif'
-        
+
         # 也设置plt的参数
         plt.rcParams['font.sans-serif'] = chinese_fonts
         plt.rcParams['axes.unicode_minus'] = False
         plt.rcParams['font.family'] = 'sans-serif'
-        
-        print(f"已设置中文字体: {chinese_fonts[0]}")
+
         return chinese_fonts[0]
     else:
-        # 如果没有找到中文字体，使用默认设置并提示
+        # 如果没有找到中文字体，使用默认设置
         fallback_fonts = ['Arial', 'DejaVu Sans', 'sans-serif']
         mpl.rcParams['font.sans-serif'] = fallback_fonts
         mpl.rcParams['axes.unicode_minus'] = False
         plt.rcParams['font.sans-serif'] = fallback_fonts
         plt.rcParams['axes.unicode_minus'] = False
-        print("未找到中文字体，使用默认字体，中文可能显示为方块")
-        return None 
\ No newline at end of file
+        return None
@@ -0,0 +1,79 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def inequality_by_group(values: np.ndarray, codes: Optional[np.ndarray] = None) -> pd.DataFrame:
+    # 一次 lexsort 把数据按 (组, 数值) 排好，每个组是一段连续的升序数组，
+    # 基尼系数、头部占比、赫芬达尔指数都由累计和与 reduceat 直接算出，不逐组循环
+    # codes 为 pd.factorize 的编码，-1（缺失）和数值缺失的行不参与计算；返回以组编码为索引的表
+    values = np.asarray(values, dtype='float64')
+    codes = np.zeros(len(values), dtype='int64') if codes is None else np.asarray(codes)
+    valid = ~np.isnan(values) & (codes >= 0)
+    values, codes = values[valid], codes[valid]
+    columns = ['count', 'total', 'gini', 'top1_share', 'top10_share', 'hhi']
+    if not len(values):
+        return pd.DataFrame(columns=columns)
+
+    order = np.lexsort((values, codes))
+    sorted_values = values[order]
+    sorted_codes = codes[order]
+
+    starts = np.flatnonzero(np.concatenate(([True], sorted_codes[1:] != sorted_codes[:-1])))
+    counts = np.diff(np.append(starts, len(sorted_values)))
+    ends = starts + counts
+    cumulative = np.concatenate(([0.0], np.cumsum(sorted_values)))
+    totals = cumulative[ends] - cumulative[starts]
+
+    # 组内名次（从 1 开始）：G = 2 * Σ(i * x_i) / (n * Σx) - (n + 1) / n
+    ranks = np.arange(len(sorted_values)) - np.repeat(starts, counts) + 1
+    weighted = np.add.reduceat(ranks * sorted_values, starts)
+    squares = np.add.reduceat(sorted_values * sorted_values, starts)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gini = 2 * weighted / (counts * totals) - (counts + 1) / counts
+        hhi = squares / (totals * totals)
+        shares = {}
+        for label, fraction in (('top1_share', 0.01), ('top10_share', 0.10)):
+            # 头部人数向上取整且至少 1 人；组内升序，头部即每段末尾的 k 个值
+            top_k = np.maximum(np.ceil(counts * fraction).astype('int64'), 1)
+            shares[label] = (cumulative[ends] - cumulative[ends - top_k]) / totals * 100
+
+    return pd.DataFrame({
+        'count': counts,
+        'total': totals,
+        'gini': gini,
+        'top1_share': shares['top1_share'],
+        'top10_share': shares['top10_share'],
+        'hhi': hhi,
+    }, index=sorted_codes[starts])
+
+
+def lorenz_curve(values: np.ndarray, points: int = 101) -> Tuple[np.ndarray, np.ndarray]:
+    # 洛伦兹曲线：人口累计占比 -> 财富累计占比，插值到固定数量的点，便于保存和绘图
+    values = np.asarray(values, dtype='float64')
+    values = np.sort(values[~np.isnan(values)])
+    grid = np.linspace(0, 1, points)
+    if not len(values) or values.sum() <= 0:
+        return grid, grid.copy()
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    population = np.linspace(0, 1, len(values) + 1)
+    return grid, np.interp(grid, population, cumulative / cumulative[-1])
+
+
+def concentration_index(totals: np.ndarray) -> float:
+    # 赫芬达尔指数：各组财富占比的平方和，越接近 1 表示财富越集中在少数组
+    totals = np.asarray(totals, dtype='float64')
+    overall = totals.sum()
+    return float(((totals / overall) ** 2).sum()) if overall > 0 else float('nan')
+
+
+def stats_to_dict(stats: pd.Series) -> Dict:
+    return {
+        'count': int(stats['count']),
+        'gini': round(float(stats['gini']), 4),
+        'top1_share': round(float(stats['top1_share']), 2),
+        'top10_share': round(float(stats['top10_share']), 2),
+        'hhi': round(float(stats['hhi']), 4),
+    }
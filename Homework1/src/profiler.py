@@ -0,0 +1,160 @@
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+
+class StageProfiler:
+
+    def __init__(self, enabled: bool = True, trace_memory: bool = True, use_cprofile: bool = False):
+        # enabled=False 时所有埋点都是空操作，可以在主流程中常驻
+        self.enabled = enabled
+        self.trace_memory = trace_memory and enabled
+        self.records: List[Dict] = []
+        self._stack: List[Dict] = []
+        self._started_tracemalloc = False
+        self._cprofile = cProfile.Profile() if (enabled and use_cprofile) else None
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self._cprofile:
+            self._cprofile.enable()
+
+    def stop(self) -> None:
+        if not self.enabled:
+            return
+        if self._cprofile:
+            self._cprofile.disable()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        # 记录阶段的墙钟时间、CPU 时间和内存峰值；阶段可以嵌套，子阶段的峰值会计入父阶段
+        if not self.enabled:
+            yield
+            return
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+        else:
+            current = 0
+
+        frame = {
+            'name': name,
+            'path': '/'.join([item['name'] for item in self._stack] + [name]),
+            'depth': len(self._stack),
+            'start_mem': current,
+            'peak': current,
+        }
+        # 进入阶段时先占位，记录顺序与阶段开始顺序一致，父阶段排在子阶段之前
+        record = {'name': name, 'path': frame['path'], 'depth': frame['depth']}
+        self.records.append(record)
+        self._stack.append(frame)
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start_wall
+            cpu = time.process_time() - start_cpu
+            self._stack.pop()
+
+            peak_bytes = None
+            if tracing:
+                peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+                peak_bytes = peak - frame['start_mem']
+                if self._stack:
+                    self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+
+            record.update({
+                'wall_seconds': round(wall, 6),
+                'cpu_seconds': round(cpu, 6),
+                'peak_memory_mb': round(peak_bytes / 1024 / 1024, 3) if peak_bytes is not None else None,
+            })
+
+    def record(self, name: str, wall_seconds: float) -> None:
+        # 记录在其他进程中完成、只能拿到耗时的阶段（如并行渲染的图表）
+        if not self.enabled:
+            return
+        parents = [item['name'] for item in self._stack]
+        self.records.append({
+            'name': name,
+            'path': '/'.join(parents + [name]),
+            'depth': len(parents),
+            'wall_seconds': round(wall_seconds, 6),
+            'cpu_seconds': None,
+            'peak_memory_mb': None,
+        })
+
+    def profile(self, name: Optional[str] = None):
+        # 装饰器形式：@profiler.profile() 或 @profiler.profile('阶段名')
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name or func.__qualname__):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def summary(self) -> List[Dict]:
+        # 按阶段路径汇总，同一阶段多次执行时累加耗时、取内存峰值的最大值
+        totals: Dict[str, Dict] = {}
+        for item in self.records:
+            entry = totals.setdefault(item['path'], {
+                'path': item['path'],
+                'depth': item['depth'],
+                'calls': 0,
+                'wall_seconds': 0.0,
+                'cpu_seconds': None,
+                'peak_memory_mb': None,
+            })
+            entry['calls'] += 1
+            entry['wall_seconds'] += item['wall_seconds']
+            if item['cpu_seconds'] is not None:
+                entry['cpu_seconds'] = (entry['cpu_seconds'] or 0.0) + item['cpu_seconds']
+            if item['peak_memory_mb'] is not None:
+                entry['peak_memory_mb'] = max(entry['peak_memory_mb'] or 0.0, item['peak_memory_mb'])
+        return list(totals.values())
+
+    def print_summary(self) -> None:
+        if not self.records:
+            return
+        print(f"{'阶段':<44} {'次数':>4} {'墙钟(秒)':>10} {'CPU(秒)':>10} {'峰值内存(MB)':>12}")
+        for entry in self.summary():
+            label = '  ' * entry['depth'] + entry['path'].rsplit('/', 1)[-1]
+            cpu = f"{entry['cpu_seconds']:.3f}" if entry['cpu_seconds'] is not None else '-'
+            mem = f"{entry['peak_memory_mb']:.1f}" if entry['peak_memory_mb'] is not None else '-'
+            print(f"{label:<44} {entry['calls']:>4} {entry['wall_seconds']:>10.3f} {cpu:>10} {mem:>12}")
+
+    def save(self, filename: str) -> None:
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump({'stages': self.records, 'summary': self.summary()}, f, ensure_ascii=False, indent=2)
+        print(f"阶段耗时已保存到：{filename}")
+
+    def save_cprofile(self, filename: str) -> None:
+        # 输出 pstats 格式，可用 python -m pstats 或 snakeviz 查看
+        if not self._cprofile:
+            return
+        self._cprofile.dump_stats(filename)
+        print(f"cProfile 结果已保存到：{filename}")
@@ -0,0 +1,98 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class RankingIndex:
+
+    def __init__(self, data: pd.DataFrame, column: str, descending: bool = True,
+                 group_columns: Sequence[str] = (), positive_only: bool = False):
+        # 对 column 做一次排序后，前 N 名、名次、百分位、分位数查询都只需二分查找或切片
+        # descending=True 时数值越大名次越靠前（财富），False 时越小越靠前（年龄）
+        # positive_only=True 时忽略 <= 0 的值（年龄未知时记为 0）
+        self.data = data
+        self.column = column
+        self.descending = descending
+
+        values = pd.to_numeric(data[column], errors='coerce').to_numpy(dtype='float64')
+        valid = ~np.isnan(values)
+        if positive_only:
+            valid &= values > 0
+        self._positions = np.flatnonzero(valid)
+        # 降序时对相反数升序排序；使用稳定排序，同值时保持原有行序，与 nlargest / nsmallest 一致
+        self._keys_all = -values[valid] if descending else values[valid]
+
+        order = np.argsort(self._keys_all, kind='stable')
+        self.keys = self._keys_all[order]
+        self.order = self._positions[order]
+
+        # 分组索引：先按组编码、再按数值排序，每个组在排序结果中是一段连续切片
+        self._groups: Dict[str, Tuple[np.ndarray, np.ndarray, Dict]] = {}
+        for group_column in group_columns:
+            self._build_group(group_column)
+
+    def _build_group(self, group_column: str) -> None:
+        codes, uniques = pd.factorize(self.data[group_column].to_numpy()[self._positions])
+        order = np.lexsort((self._keys_all, codes))
+        sorted_codes = codes[order]
+        boundaries = np.flatnonzero(np.diff(sorted_codes)) + 1
+        starts = np.concatenate(([0], boundaries))
+        stops = np.concatenate((boundaries, [len(sorted_codes)]))
+        slices = {}
+        for start, stop in zip(starts, stops):
+            if stop > start and sorted_codes[start] >= 0:
+                slices[uniques[sorted_codes[start]]] = (start, stop)
+        self._groups[group_column] = (self._keys_all[order], self._positions[order], slices)
+
+    def _segment(self, group_column: Optional[str] = None, group=None) -> Tuple[np.ndarray, np.ndarray]:
+        if group_column is None:
+            return self.keys, self.order
+        if group_column not in self._groups:
+            self._build_group(group_column)
+        keys, order, slices = self._groups[group_column]
+        start, stop = slices.get(group, (0, 0))
+        return keys[start:stop], order[start:stop]
+
+    def groups(self, group_column: str) -> List:
+        if group_column not in self._groups:
+            self._build_group(group_column)
+        return list(self._groups[group_column][2])
+
+    def _key(self, value: float) -> float:
+        return -value if self.descending else value
+
+    def size(self, group_column: Optional[str] = None, group=None) -> int:
+        return len(self._segment(group_column, group)[0])
+
+    def top_n(self, n: int = 10, group_column: Optional[str] = None, group=None) -> pd.DataFrame:
+        # 名次最靠前的 n 行，顺序与 nlargest / nsmallest 相同
+        _, order = self._segment(group_column, group)
+        return self.data.iloc[order[:n]]
+
+    def rank_of(self, value: float, group_column: Optional[str] = None, group=None) -> int:
+        # 并列时取最好名次，名次从 1 开始
+        keys, _ = self._segment(group_column, group)
+        return int(np.searchsorted(keys, self._key(value), side='left')) + 1
+
+    def percentile(self, value: float, group_column: Optional[str] = None, group=None) -> float:
+        # 不高于 value 的样本占比（%）
+        keys, _ = self._segment(group_column, group)
+        if not len(keys):
+            return float('nan')
+        if self.descending:
+            count = len(keys) - np.searchsorted(keys, -value, side='left')
+        else:
+            count = np.searchsorted(keys, value, side='right')
+        return float(count) / len(keys) * 100
+
+    def quantile(self, q: float, group_column: Optional[str] = None, group=None) -> float:
+        # 线性插值，与 pandas Series.quantile 的默认算法一致
+        keys, _ = self._segment(group_column, group)
+        if not len(keys):
+            return float('nan')
+        values = -keys[::-1] if self.descending else keys
+        position = q * (len(values) - 1)
+        lower = int(np.floor(position))
+        upper = min(lower + 1, len(values) - 1)
+        return float(values[lower] + (values[upper] - values[lower]) * (position - lower))
@@ -0,0 +1,34 @@
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        # rate：每秒补充的令牌数；capacity：桶容量，即允许的最大突发请求数
+        if rate <= 0:
+            raise ValueError("rate 必须大于 0")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        if tokens > self.capacity:
+            raise ValueError("单次申请的令牌数不能超过桶容量")
+
+        # 阻塞直到拿到令牌，返回累计等待的秒数
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                wait_time = (tokens - self.tokens) / self.rate
+            time.sleep(wait_time)
+            waited += wait_time
@@ -0,0 +1,163 @@
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from .data_collector import CHARACTER_FIELDS, RICH_FIELDS, DataCollector
+
+# 与榜单接口相同的路径，采集器只需替换 base_url 中的主机部分
+API_PATH = "/zh-CN/Rank/HsRankDetailsList"
+
+
+def fixture_path(fixture_dir: str, list_id: str) -> str:
+    return os.path.join(fixture_dir, f"{list_id}.json")
+
+
+def record_fixtures(collector: DataCollector, fixture_dir: str, max_pages: int = 50, limit: int = 20) -> str:
+    # 按页请求真实接口，把原始 rows 按顺序合并保存为一个榜单的回放数据
+    rows: List[Dict] = []
+    total = None
+    for page_index in range(max_pages):
+        page_data = collector.collect_page_data(page_index * limit, limit)
+        if not page_data or not page_data.get('rows'):
+            break
+        total = page_data.get('total', total)
+        rows.extend(page_data['rows'])
+        print(f"已录制第 {page_index + 1} 页，累计 {len(rows)} 条数据")
+        if len(page_data['rows']) < limit:
+            break
+
+    os.makedirs(fixture_dir, exist_ok=True)
+    path = fixture_path(fixture_dir, collector.list_id)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'list_id': collector.list_id, 'total': total or len(rows), 'rows': rows}, f, ensure_ascii=False)
+    print(f"回放数据已保存到：{path}")
+    return path
+
+
+def load_fixtures(fixture_dir: str) -> Dict[str, List[Dict]]:
+    fixtures = {}
+    for filename in sorted(os.listdir(fixture_dir)):
+        if not filename.endswith('.json'):
+            continue
+        with open(os.path.join(fixture_dir, filename), 'r', encoding='utf-8') as f:
+            fixture = json.load(f)
+        fixtures[fixture.get('list_id', filename[:-5])] = fixture['rows']
+    return fixtures
+
+
+def rows_from_frame(df: pd.DataFrame) -> List[Dict]:
+    # 由已保存的 hurun_raw_data.csv 还原接口的原始行结构，没有录制数据时也能离线压测
+    df = df.astype(object).where(df.notna(), None)
+    rows = []
+    for record in df.to_dict('records'):
+        row = {raw: record.get(column) for raw, (column, _) in RICH_FIELDS.items()}
+        row['hs_Character'] = [{raw: record.get(column) for raw, (column, _) in CHARACTER_FIELDS.items()}]
+        rows.append(row)
+    return rows
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+
+        server.replay.before_response()
+        if server.replay.should_fail():
+            self._send_json(503, {'error': 'injected failure'})
+            return
+
+        rows = server.replay.fixtures.get(params.get('num', [''])[0])
+        if url.path != API_PATH or rows is None:
+            self._send_json(404, {'error': 'unknown list'})
+            return
+
+        try:
+            offset = int(params.get('offset', ['0'])[0])
+            limit = int(params.get('limit', ['20'])[0])
+        except ValueError:
+            self._send_json(400, {'error': 'bad offset/limit'})
+            return
+        self._send_json(200, {'total': len(rows), 'rows': rows[offset:offset + limit]})
+
+    def _send_json(self, status: int, payload: Dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 压测时请求量大，不输出访问日志
+        pass
+
+
+class ReplayServer:
+
+    def __init__(self, fixtures: Dict[str, List[Dict]], host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        # latency / jitter：每次响应前等待 latency ± jitter 秒；error_rate：按比例返回 503
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.error_count = 0
+
+        self.httpd = ThreadingHTTPServer((host, port), _ReplayHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.replay = self
+        self.thread = None
+
+    @classmethod
+    def from_dir(cls, fixture_dir: str, **kwargs) -> "ReplayServer":
+        return cls(load_fixtures(fixture_dir), **kwargs)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PATH}"
+
+    def before_response(self) -> None:
+        with self.lock:
+            self.request_count += 1
+            delay = self.latency + self.random.uniform(-self.jitter, self.jitter) if self.jitter else self.latency
+        if delay > 0:
+            time.sleep(delay)
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            failed = self.error_rate > 0 and self.random.random() < self.error_rate
+            if failed:
+                self.error_count += 1
+            return failed
+
+    def start(self) -> "ReplayServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
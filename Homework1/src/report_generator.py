@@ -1,285 +1,451 @@
 
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, TextIO
 import datetime
+import html
 import os
+import re
+
+
+# 输出文件后缀与报告格式的对应关系；文本报告本身就是 Markdown 排版
+REPORT_FORMATS = {
+    '.txt': 'text',
+    '.md': 'markdown',
+    '.html': 'html',
+    '.htm': 'html',
+}
+
+
+class HtmlReportWriter:
+    # 把逐行输出的 Markdown 报告即时转换为 HTML 写入 sink，不在内存中拼接整篇报告
+
+    def __init__(self, sink: TextIO, title: str):
+        self.sink = sink
+        self.list_tag = None
+        self.pending = ""
+        self.sink.write("<!DOCTYPE html>\n<html lang=\"zh-CN\">\n<head>\n<meta charset=\"utf-8\">\n")
+        self.sink.write(f"<title>{html.escape(title)}</title>\n</head>\n<body>\n")
+
+    def write(self, text: str) -> None:
+        # 分段写入的文本可能在行中间截断，未结束的部分留到下次处理
+        lines = (self.pending + text).split("\n")
+        self.pending = lines.pop()
+        for line in lines:
+            self._write_line(line)
+
+    def close(self) -> None:
+        if self.pending:
+            self._write_line(self.pending)
+            self.pending = ""
+        self._close_list()
+        self.sink.write("</body>\n</html>\n")
+
+    def _inline(self, text: str) -> str:
+        return re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", html.escape(text))
+
+    def _open_list(self, tag: str) -> None:
+        if self.list_tag != tag:
+            self._close_list()
+            self.sink.write(f"<{tag}>\n")
+            self.list_tag = tag
+
+    def _close_list(self) -> None:
+        if self.list_tag:
+            self.sink.write(f"</{self.list_tag}>\n")
+            self.list_tag = None
+
+    def _write_line(self, line: str) -> None:
+        line = line.strip()
+        heading = re.match(r"^(#{1,6})\s+(.*)$", line)
+        ordered = re.match(r"^\d+\.\s+(.*)$", line)
+        if not line:
+            self._close_list()
+        elif heading:
+            self._close_list()
+            level = len(heading.group(1))
+            self.sink.write(f"<h{level}>{self._inline(heading.group(2))}</h{level}>\n")
+        elif line.startswith("- "):
+            self._open_list("ul")
+            self.sink.write(f"<li>{self._inline(line[2:])}</li>\n")
+        elif ordered:
+            self._open_list("ol")
+            self.sink.write(f"<li>{self._inline(ordered.group(1))}</li>\n")
+        else:
+            self._close_list()
+            self.sink.write(f"<p>{self._inline(line)}</p>\n")
 
 
 class ReportGenerator:
-    
-    def __init__(self, analysis_results: Dict, chart_paths: List[str]):
+
+    def __init__(self, analysis_results: Dict, chart_paths: List[str], year: int = 2024):
+        # year：报告对应的榜单年份，多年份数据时为最新一年
         self.analysis_results = analysis_results
         self.chart_paths = chart_paths
+        self.year = year
         self.report_content = []
-        
-    def generate_executive_summary(self) -> str:
+
+    # 各章节以生成器形式逐行产出内容，既可拼接为字符串，也可直接流式写入文件
+
+    def iter_executive_summary(self) -> Iterator[str]:
         basic_stats = self.analysis_results.get('basic_stats', {})
         total_count = basic_stats.get('total_count', 0)
-        
-        summary = f"""## 数据概况
 
-**基本信息：**
-- 样本总数：{total_count}人
-- 数据来源：胡润百富榜官方网站
-- 分析时间：{datetime.datetime.now().strftime('%Y年%m月%d日')}
+        yield "## 数据概况\n"
+        yield "\n"
+        yield "**基本信息：**\n"
+        yield f"- 样本总数：{total_count}人\n"
+        yield "- 数据来源：胡润百富榜官方网站\n"
+        yield f"- 分析时间：{datetime.datetime.now().strftime('%Y年%m月%d日')}\n"
+        yield "\n"
+        yield "**关键数据：**\n"
 
-**关键数据：**
-"""
-        
         # 行业分析摘要
         industry_analysis = self.analysis_results.get('industry_analysis', {})
         if industry_analysis.get('industry_count'):
-            top_industry = list(industry_analysis['industry_count'].items())[0]
-            summary += f"- 最主要的行业是{top_industry[0]}，拥有{top_industry[1]}位富豪\n"
-        
+            top_industry = next(iter(industry_analysis['industry_count'].items()))
+            yield f"- 最主要的行业是{top_industry[0]}，拥有{top_industry[1]}位富豪\n"
+
         # 财富分析摘要
         wealth_analysis = self.analysis_results.get('wealth_analysis', {})
         if wealth_analysis.get('wealth_stats'):
             wealth_stats = wealth_analysis['wealth_stats']
-            summary += f"- 平均财富值为{wealth_stats.get('mean', 0):.2f}亿元\n"
-            summary += f"- 财富总值达到{wealth_stats.get('total', 0):.2f}亿元\n"
-        
+            yield f"- 平均财富值为{wealth_stats.get('mean', 0):.2f}亿元\n"
+            yield f"- 财富总值达到{wealth_stats.get('total', 0):.2f}亿元\n"
+
         # 年龄分析摘要
         age_analysis = self.analysis_results.get('age_analysis', {})
         if age_analysis.get('age_stats'):
             age_stats = age_analysis['age_stats']
-            summary += f"- 富豪平均年龄为{age_stats.get('mean', 0):.1f}岁\n"
-        
+            yield f"- 富豪平均年龄为{age_stats.get('mean', 0):.1f}岁\n"
+
         # 地区分析摘要
         location_analysis = self.analysis_results.get('location_analysis', {})
         if location_analysis.get('location_count'):
-            top_location = list(location_analysis['location_count'].items())[0]
-            summary += f"- 富豪最集中的地区是{top_location[0]}，拥有{top_location[1]}位富豪\n"
-        
-        return summary
-    
-    def generate_industry_analysis(self) -> str:
+            top_location = next(iter(location_analysis['location_count'].items()))
+            yield f"- 富豪最集中的地区是{top_location[0]}，拥有{top_location[1]}位富豪\n"
+
+    def iter_industry_analysis(self) -> Iterator[str]:
         industry_analysis = self.analysis_results.get('industry_analysis', {})
         if not industry_analysis:
-            return "## 行业分析\n\n暂无行业数据可供分析。\n"
-        
-        content = "## 行业分析\n\n"
-        
+            yield "## 行业分析\n\n暂无行业数据可供分析。\n"
+            return
+
+        yield "## 行业分析\n\n"
+
         # 行业分布统计
         industry_count = industry_analysis.get('industry_count', {})
         if industry_count:
-            content += "### 各行业富豪数量分布\n\n"
+            yield "### 各行业富豪数量分布\n\n"
             for i, (industry, count) in enumerate(list(industry_count.items())[:10], 1):
-                content += f"{i}. {industry}：{count}人\n"
-            content += "\n"
-        
+                yield f"{i}. {industry}：{count}人\n"
+            yield "\n"
+
         # 行业财富分析
         industry_wealth = industry_analysis.get('industry_wealth', {})
         if industry_wealth and 'sum' in industry_wealth:
-            content += "### 各行业财富总值排名\n\n"
+            yield "### 各行业财富总值排名\n\n"
             wealth_sum = industry_wealth['sum']
             sorted_wealth = sorted(wealth_sum.items(), key=lambda x: x[1], reverse=True)
-            
+
             for i, (industry, total_wealth) in enumerate(sorted_wealth[:10], 1):
                 avg_wealth = industry_wealth.get('mean', {}).get(industry, 0)
-                content += f"{i}. {industry}：总财富 {total_wealth:.2f}亿元，平均财富 {avg_wealth:.2f}亿元\n"
-            content += "\n"
-        
-        return content
-    
-    def generate_demographic_analysis(self) -> str:
-        content = "## 人口统计分析\n\n"
-        
+                yield f"{i}. {industry}：总财富 {total_wealth:.2f}亿元，平均财富 {avg_wealth:.2f}亿元\n"
+            yield "\n"
+
+    def iter_demographic_analysis(self) -> Iterator[str]:
+        yield "## 人口统计分析\n\n"
+
         # 年龄分析
         age_analysis = self.analysis_results.get('age_analysis', {})
         if age_analysis:
-            content += "### 年龄结构分析\n\n"
-            
+            yield "### 年龄结构分析\n\n"
+
             age_stats = age_analysis.get('age_stats', {})
             if age_stats:
-                content += f"**年龄统计指标：**\n"
-                content += f"- 平均年龄：{age_stats.get('mean', 0):.1f}岁\n"
-                content += f"- 年龄中位数：{age_stats.get('median', 0):.1f}岁\n"
-                content += f"- 最年轻：{age_stats.get('min', 0):.0f}岁\n"
-                content += f"- 最年长：{age_stats.get('max', 0):.0f}岁\n\n"
-            
+                yield "**年龄统计指标：**\n"
+                yield f"- 平均年龄：{age_stats.get('mean', 0):.1f}岁\n"
+                yield f"- 年龄中位数：{age_stats.get('median', 0):.1f}岁\n"
+                yield f"- 最年轻：{age_stats.get('min', 0):.0f}岁\n"
+                yield f"- 最年长：{age_stats.get('max', 0):.0f}岁\n\n"
+
             age_distribution = age_analysis.get('age_distribution', {})
             if age_distribution:
-                content += "**年龄段分布：**\n"
+                yield "**年龄段分布：**\n"
                 for age_group, count in age_distribution.items():
-                    content += f"- {age_group}：{count}人\n"
-                content += "\n"
-        
+                    yield f"- {age_group}：{count}人\n"
+                yield "\n"
+
         # 性别分析
         gender_analysis = self.analysis_results.get('gender_analysis', {})
         if gender_analysis:
-            content += "### 性别结构分析\n\n"
-            
+            yield "### 性别结构分析\n\n"
+
             gender_count = gender_analysis.get('gender_count', {})
             if gender_count:
                 total_gender = sum(gender_count.values())
-                content += "**性别分布：**\n"
+                yield "**性别分布：**\n"
                 for gender, count in gender_count.items():
                     percentage = (count / total_gender) * 100 if total_gender > 0 else 0
-                    content += f"- {gender}：{count}人（{percentage:.1f}%）\n"
-                content += "\n"
-            
+                    yield f"- {gender}：{count}人（{percentage:.1f}%）\n"
+                yield "\n"
+
             gender_wealth = gender_analysis.get('gender_wealth', {})
             if gender_wealth and 'mean' in gender_wealth:
-                content += "**性别财富差异：**\n"
+                yield "**性别财富差异：**\n"
                 for gender, avg_wealth in gender_wealth['mean'].items():
-                    content += f"- {gender}平均财富：{avg_wealth:.2f}亿元\n"
-                content += "\n"
-        
+                    yield f"- {gender}平均财富：{avg_wealth:.2f}亿元\n"
+                yield "\n"
+
         # 地区分析
         location_analysis = self.analysis_results.get('location_analysis', {})
         if location_analysis:
-            content += "### 地区分布分析\n\n"
-            
+            yield "### 地区分布分析\n\n"
+
             location_count = location_analysis.get('location_count', {})
             if location_count:
-                content += "**主要地区富豪数量（前10名）：**\n"
+                yield "**主要地区富豪数量（前10名）：**\n"
                 for i, (location, count) in enumerate(list(location_count.items())[:10], 1):
-                    content += f"{i}. {location}：{count}人\n"
-                content += "\n"
-        
-        return content
-    
-    def generate_wealth_analysis(self) -> str:
+                    yield f"{i}. {location}：{count}人\n"
+                yield "\n"
+
+    def iter_wealth_analysis(self) -> Iterator[str]:
         wealth_analysis = self.analysis_results.get('wealth_analysis', {})
         if not wealth_analysis:
-            return "## 财富分析\n\n暂无财富数据可供分析。\n"
-        
-        content = "## 财富分析\n\n"
-        
+            yield "## 财富分析\n\n暂无财富数据可供分析。\n"
+            return
+
+        yield "## 财富分析\n\n"
+
         # 财富统计
         wealth_stats = wealth_analysis.get('wealth_stats', {})
         if wealth_stats:
-            content += "### 财富统计概况\n\n"
-            content += f"**基本统计指标：**\n"
-            content += f"- 平均财富：{wealth_stats.get('mean', 0):.2f}亿元\n"
-            content += f"- 财富中位数：{wealth_stats.get('median', 0):.2f}亿元\n"
-            content += f"- 财富总和：{wealth_stats.get('total', 0):.2f}亿元\n"
-            content += f"- 最低财富：{wealth_stats.get('min', 0):.2f}亿元\n"
-            content += f"- 最高财富：{wealth_stats.get('max', 0):.2f}亿元\n"
-            content += f"- 标准差：{wealth_stats.get('std', 0):.2f}亿元\n\n"
-        
+            yield "### 财富统计概况\n\n"
+            yield "**基本统计指标：**\n"
+            yield f"- 平均财富：{wealth_stats.get('mean', 0):.2f}亿元\n"
+            yield f"- 财富中位数：{wealth_stats.get('median', 0):.2f}亿元\n"
+            yield f"- 财富总和：{wealth_stats.get('total', 0):.2f}亿元\n"
+            yield f"- 最低财富：{wealth_stats.get('min', 0):.2f}亿元\n"
+            yield f"- 最高财富：{wealth_stats.get('max', 0):.2f}亿元\n"
+            yield f"- 标准差：{wealth_stats.get('std', 0):.2f}亿元\n\n"
+
         # 财富分布
         wealth_distribution = wealth_analysis.get('wealth_distribution', {})
         if wealth_distribution:
-            content += "### 财富区间分布\n\n"
+            yield "### 财富区间分布\n\n"
             for wealth_range, count in wealth_distribution.items():
-                content += f"- {wealth_range}：{count}人\n"
-            content += "\n"
-        
+                yield f"- {wealth_range}：{count}人\n"
+            yield "\n"
 
-        
-        return content
+    def iter_inequality_analysis(self) -> Iterator[str]:
+        inequality = self.analysis_results.get('inequality_analysis', {})
+        if not inequality:
+            return
+        
+        yield "## 财富集中度分析\n\n"
+        
+        overall = inequality.get('overall', {})
+        if overall:
+            yield "**整体指标：**\n"
+            yield f"- 基尼系数：{overall.get('gini', 0):.4f}\n"
+            yield f"- 前1%富豪财富占比：{overall.get('top1_share', 0):.2f}%\n"
+            yield f"- 前10%富豪财富占比：{overall.get('top10_share', 0):.2f}%\n"
+            yield f"- 赫芬达尔指数：{overall.get('hhi', 0):.4f}\n"
+        if 'industry_concentration' in inequality:
+            yield f"- 行业间财富集中度（赫芬达尔指数）：{inequality['industry_concentration']:.4f}\n"
+        if 'location_concentration' in inequality:
+            yield f"- 地区间财富集中度（赫芬达尔指数）：{inequality['location_concentration']:.4f}\n"
+        yield "\n"
+        
+        industry_inequality = inequality.get('industry_inequality', {})
+        if industry_inequality:
+            yield "### 主要行业内部不平等程度\n\n"
+            for i, (industry, stats) in enumerate(list(industry_inequality.items())[:10], 1):
+                yield (f"{i}. {industry}：基尼系数 {stats.get('gini', 0):.4f}，"
+                       f"前10%占比 {stats.get('top10_share', 0):.2f}%（{stats.get('count', 0)}人）\n")
+            yield "\n"
     
-    def generate_top_lists(self) -> str:
+    def iter_top_lists(self) -> Iterator[str]:
         top_lists = self.analysis_results.get('top_lists', {})
         if not top_lists:
-            return "## 排行榜\n\n暂无排行榜数据。\n"
-        
-        content = "## 排行榜\n\n"
-        
+            yield "## 排行榜\n\n暂无排行榜数据。\n"
+            return
+
+        yield "## 排行榜\n\n"
+
         # 财富排行榜
         top_wealth = top_lists.get('top_wealth', [])
         if top_wealth:
-            content += "### 财富排行榜（前10名）\n\n"
+            yield "### 财富排行榜（前10名）\n\n"
             for i, person in enumerate(top_wealth[:10], 1):
                 name = person.get('name', '未知')
                 wealth = person.get('wealth_numeric', 0)
                 industry = person.get('industry_clean', '未知')
                 location = person.get('location_clean', '未知')
-                content += f"{i}. {name} - {wealth:.2f}亿元（{industry}，{location}）\n"
-            content += "\n"
-        
+                yield f"{i}. {name} - {wealth:.2f}亿元（{industry}，{location}）\n"
+            yield "\n"
+
         # 最年轻富豪排行榜
         youngest = top_lists.get('youngest', [])
         if youngest:
-            content += "### 最年轻富豪排行榜（前10名）\n\n"
+            yield "### 最年轻富豪排行榜（前10名）\n\n"
             for i, person in enumerate(youngest[:10], 1):
                 name = person.get('name', '未知')
                 age = person.get('age_numeric', 0)
                 wealth = person.get('wealth_numeric', 0)
                 industry = person.get('industry_clean', '未知')
-                content += f"{i}. {name} - {age}岁，{wealth:.2f}亿元（{industry}）\n"
-            content += "\n"
-        
-        return content
-    
-    def generate_conclusions(self) -> str:
+                yield f"{i}. {name} - {age}岁，{wealth:.2f}亿元（{industry}）\n"
+            yield "\n"
+
+    def iter_conclusions(self) -> Iterator[str]:
         basic_stats = self.analysis_results.get('basic_stats', {})
         total_count = basic_stats.get('total_count', 0)
-        
-        content = f"""## 数据汇总
 
-### 分析总数
-- 总样本数：{total_count}人
+        yield "## 数据汇总\n"
+        yield "\n"
+        yield "### 分析总数\n"
+        yield f"- 总样本数：{total_count}人\n"
+        yield "\n"
+        yield "### 行业分布概况\n"
 
-### 行业分布概况
-"""
-        
         industry_analysis = self.analysis_results.get('industry_analysis', {})
         if industry_analysis.get('industry_count'):
             industry_count = industry_analysis['industry_count']
-            content += f"- 涉及行业数量：{len(industry_count)}个\n"
+            yield f"- 涉及行业数量：{len(industry_count)}个\n"
             if industry_count:
-                top_industry = list(industry_count.items())[0]
-                content += f"- 最大行业：{top_industry[0]}（{top_industry[1]}人）\n"
-        
-        content += "\n### 财富数据概况\n"
+                top_industry = next(iter(industry_count.items()))
+                yield f"- 最大行业：{top_industry[0]}（{top_industry[1]}人）\n"
+
+        yield "\n### 财富数据概况\n"
         wealth_analysis = self.analysis_results.get('wealth_analysis', {})
         if wealth_analysis.get('wealth_stats'):
             wealth_stats = wealth_analysis['wealth_stats']
-            content += f"- 财富总额：{wealth_stats.get('total', 0):.2f}亿元\n"
-            content += f"- 平均财富：{wealth_stats.get('mean', 0):.2f}亿元\n"
-            content += f"- 财富中位数：{wealth_stats.get('median', 0):.2f}亿元\n"
-        
-        content += "\n### 地区分布概况\n"
+            yield f"- 财富总额：{wealth_stats.get('total', 0):.2f}亿元\n"
+            yield f"- 平均财富：{wealth_stats.get('mean', 0):.2f}亿元\n"
+            yield f"- 财富中位数：{wealth_stats.get('median', 0):.2f}亿元\n"
+
+        yield "\n### 地区分布概况\n"
         location_analysis = self.analysis_results.get('location_analysis', {})
         if location_analysis.get('location_count'):
             location_count = location_analysis['location_count']
-            content += f"- 涉及地区数量：{len(location_count)}个\n"
+            yield f"- 涉及地区数量：{len(location_count)}个\n"
             if location_count:
-                top_location = list(location_count.items())[0]
-                content += f"- 最大地区：{top_location[0]}（{top_location[1]}人）\n"
-        
-        content += "\n### 年龄数据概况\n"
+                top_location = next(iter(location_count.items()))
+                yield f"- 最大地区：{top_location[0]}（{top_location[1]}人）\n"
+
+        yield "\n### 年龄数据概况\n"
         age_analysis = self.analysis_results.get('age_analysis', {})
         if age_analysis.get('age_stats'):
             age_stats = age_analysis['age_stats']
-            content += f"- 平均年龄：{age_stats.get('mean', 0):.1f}岁\n"
-            content += f"- 年龄范围：{age_stats.get('min', 0):.0f}-{age_stats.get('max', 0):.0f}岁\n"
-        
-        return content
+            yield f"- 平均年龄：{age_stats.get('mean', 0):.1f}岁\n"
+            yield f"- 年龄范围：{age_stats.get('min', 0):.0f}-{age_stats.get('max', 0):.0f}岁\n"
+
+    def iter_year_over_year(self) -> Iterator[str]:
+        year_over_year = self.analysis_results.get('year_over_year', {})
+        if not year_over_year:
+            return
+        
+        yield "## 年度变化\n\n"
+        for period, summary in year_over_year.items():
+            yield f"### {period.replace('-', '年至')}年\n\n"
+            yield f"- 连续上榜：{summary.get('matched_count', 0)}人\n"
+            yield f"- 新上榜：{summary.get('new_count', 0)}人\n"
+            yield f"- 落榜：{summary.get('dropped_count', 0)}人\n\n"
+            
+            top_gainers = summary.get('top_gainers', [])
+            if top_gainers:
+                yield "**财富增长最多：**\n"
+                for i, person in enumerate(top_gainers, 1):
+                    yield (f"{i}. {person.get('name', '未知')}（{person.get('company', '未知')}）："
+                           f"{person.get('wealth_delta', 0):+.2f}亿元\n")
+                yield "\n"
+            
+            top_losers = summary.get('top_losers', [])
+            if top_losers:
+                yield "**财富缩水最多：**\n"
+                for i, person in enumerate(top_losers, 1):
+                    yield (f"{i}. {person.get('name', '未知')}（{person.get('company', '未知')}）："
+                           f"{person.get('wealth_delta', 0):+.2f}亿元\n")
+                yield "\n"
+            
+            top_risers = summary.get('top_risers', [])
+            if top_risers:
+                yield "**排名上升最多：**\n"
+                for i, person in enumerate(top_risers, 1):
+                    yield (f"{i}. {person.get('name', '未知')}：第{person.get('ranking', 0):.0f}名，"
+                           f"上升{person.get('rank_delta', 0):.0f}位\n")
+                yield "\n"
     
-    def generate_full_report(self, output_file: str = "胡润百富榜分析报告.txt") -> str:
-        report_sections = [
-            f"# 2024年胡润百富榜数据分析报告\n\n",
-            f"报告生成时间：{datetime.datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}\n\n",
-            self.generate_executive_summary(),
-            "\n",
-            self.generate_industry_analysis(),
-            "\n",
-            self.generate_demographic_analysis(),
-            "\n",
-            self.generate_wealth_analysis(),
-            "\n",
-            self.generate_top_lists(),
-            "\n",
-            self.generate_conclusions(),
-            "\n",
-            "## 图表说明\n\n",
-            "本报告共生成以下图表文件：\n"
-        ]
-        
-        # 添加图表文件说明
+    def iter_chart_list(self) -> Iterator[str]:
+        yield "## 图表说明\n\n"
+        yield "本报告共生成以下图表文件：\n"
         for i, chart_path in enumerate(self.chart_paths, 1):
-            chart_name = os.path.basename(chart_path)
-            report_sections.append(f"{i}. {chart_name}\n")
-        
-        # 合并所有部分
-        full_report = "".join(report_sections)
-        
-        # 保存报告
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(full_report)
-        
+            yield f"{i}. {os.path.basename(chart_path)}\n"
+
+    def report_title(self) -> str:
+        return f"{self.year}年胡润百富榜数据分析报告"
+
+    def iter_report(self) -> Iterator[str]:
+        yield f"# {self.report_title()}\n\n"
+        yield f"报告生成时间：{datetime.datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}\n\n"
+        sections = [
+            self.iter_executive_summary,
+            self.iter_industry_analysis,
+            self.iter_demographic_analysis,
+            self.iter_wealth_analysis,
+            self.iter_top_lists,
+            self.iter_conclusions,
+        ]
+        if self.analysis_results.get('inequality_analysis'):
+            sections.insert(sections.index(self.iter_wealth_analysis) + 1, self.iter_inequality_analysis)
+        # 年度变化只在多年份数据中出现
+        if self.analysis_results.get('year_over_year'):
+            sections.insert(-1, self.iter_year_over_year)
+        for section in sections:
+            yield from section()
+            yield "\n"
+        yield from self.iter_chart_list()
+
+    # 以字符串形式返回单个章节，保持原有接口
+
+    def generate_executive_summary(self) -> str:
+        return "".join(self.iter_executive_summary())
+
+    def generate_industry_analysis(self) -> str:
+        return "".join(self.iter_industry_analysis())
+
+    def generate_demographic_analysis(self) -> str:
+        return "".join(self.iter_demographic_analysis())
+
+    def generate_wealth_analysis(self) -> str:
+        return "".join(self.iter_wealth_analysis())
+
+    def generate_top_lists(self) -> str:
+        return "".join(self.iter_top_lists())
+
+    def generate_conclusions(self) -> str:
+        return "".join(self.iter_conclusions())
+
+    def write_report(self, sink: TextIO, fmt: str = 'text') -> None:
+        # 将报告逐行写入任意文本输出对象（文件、StringIO、sys.stdout 等）
+        if fmt == 'html':
+            writer = HtmlReportWriter(sink, self.report_title())
+            for chunk in self.iter_report():
+                writer.write(chunk)
+            writer.close()
+        elif fmt in ('text', 'markdown'):
+            for chunk in self.iter_report():
+                sink.write(chunk)
+        else:
+            raise ValueError(f"不支持的报告格式：{fmt}，可选：text、markdown、html")
+
+    def generate_full_report(self, output_file: str = "胡润百富榜分析报告.txt",
+                             fmt: Optional[str] = None) -> str:
+        # fmt 为空时按后缀判断：.txt 文本、.md Markdown、.html 网页
+        if fmt is None:
+            fmt = REPORT_FORMATS.get(os.path.splitext(output_file)[1].lower(), 'text')
+
+        # 边生成边写入带缓冲的文件，不在内存中拼接整篇报告
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            self.write_report(f, fmt)
+
         print(f"分析报告已生成：{output_file}")
-        return output_file 
\ No newline at end of file
+        return output_file
@@ -0,0 +1,138 @@
+import importlib.util
+import os
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+
+def _require_pyarrow(fmt: str) -> None:
+    if importlib.util.find_spec('pyarrow') is None:
+        raise ImportError(f"读写 {fmt} 格式需要安装 pyarrow：pip install pyarrow")
+
+
+class CsvBackend:
+    # CSV 通用但会丢失类型信息，读取时需要重新解析文本
+    name = 'csv'
+
+    def save(self, df: pd.DataFrame, path: str) -> None:
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+
+    def load(self, path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return pd.read_csv(path, usecols=columns, encoding='utf-8-sig')
+
+
+class ParquetBackend:
+    # 列式存储，保留数值类型和分类类型，可只读取需要的列
+    name = 'parquet'
+
+    def save(self, df: pd.DataFrame, path: str) -> None:
+        _require_pyarrow(self.name)
+        df.to_parquet(path, index=False)
+
+    def load(self, path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        _require_pyarrow(self.name)
+        return pd.read_parquet(path, columns=columns)
+
+
+class FeatherBackend:
+    # Arrow IPC 格式，读写速度最快，适合作为中间结果
+    name = 'feather'
+
+    def save(self, df: pd.DataFrame, path: str) -> None:
+        _require_pyarrow(self.name)
+        df.reset_index(drop=True).to_feather(path)
+
+    def load(self, path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        _require_pyarrow(self.name)
+        return pd.read_feather(path, columns=columns)
+
+
+BACKENDS: Dict[str, object] = {
+    'csv': CsvBackend(),
+    'parquet': ParquetBackend(),
+    'feather': FeatherBackend(),
+}
+
+SUFFIXES: Dict[str, str] = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+}
+
+
+def register_backend(name: str, backend, suffixes: List[str] = ()) -> None:
+    # 注册新的存储后端，backend 需要提供 save(df, path) 和 load(path, columns) 方法
+    BACKENDS[name] = backend
+    for suffix in suffixes:
+        SUFFIXES[suffix.lower()] = name
+
+
+def get_backend(path: str, fmt: Optional[str] = None):
+    # 未指定格式时按文件后缀判断
+    if fmt is None:
+        suffix = os.path.splitext(path)[1].lower()
+        fmt = SUFFIXES.get(suffix, 'csv')
+    if fmt not in BACKENDS:
+        raise ValueError(f"不支持的存储格式：{fmt}，可选：{', '.join(BACKENDS)}")
+    return BACKENDS[fmt]
+
+
+def save_frame(df: pd.DataFrame, path: str, fmt: Optional[str] = None) -> None:
+    get_backend(path, fmt).save(df, path)
+
+
+def load_frame(path: str, columns: Optional[List[str]] = None, fmt: Optional[str] = None) -> pd.DataFrame:
+    return get_backend(path, fmt).load(path, columns)
+
+
+def _partition_value(value: str):
+    # 目录名中的分区值都是字符串，能转成整数的（如年份）还原为整数
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def save_partitioned(df: pd.DataFrame, root_dir: str, partition_cols: List[str], fmt: str = 'csv') -> List[str]:
+    # 按分区列写成 root_dir/列=值/part.<后缀> 的目录结构，与 Hive / pyarrow 的分区布局一致
+    backend = get_backend(root_dir, fmt)
+    suffix = next(suffix for suffix, name in SUFFIXES.items() if name == backend.name)
+    paths = []
+    for keys, part in df.groupby(partition_cols, sort=True, observed=True):
+        keys = keys if isinstance(keys, tuple) else (keys,)
+        directory = os.path.join(root_dir, *[f"{column}={value}" for column, value in zip(partition_cols, keys)])
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"part{suffix}")
+        backend.save(part.drop(columns=partition_cols), path)
+        paths.append(path)
+    return paths
+
+
+def load_partitioned(root_dir: str, columns: Optional[List[str]] = None,
+                     filters: Optional[Dict[str, List]] = None) -> pd.DataFrame:
+    # filters：分区列 -> 允许的取值，不符合的分区目录直接跳过，不读取文件
+    frames = []
+    for directory, _, filenames in sorted(os.walk(root_dir)):
+        relative = os.path.relpath(directory, root_dir)
+        if relative == '.':
+            continue
+        partition = {}
+        for part in relative.split(os.sep):
+            if '=' in part:
+                column, value = part.split('=', 1)
+                partition[column] = _partition_value(value)
+        if filters and any(partition.get(column) not in values for column, values in filters.items()):
+            continue
+        
+        for filename in sorted(filenames):
+            suffix = os.path.splitext(filename)[1].lower()
+            if suffix not in SUFFIXES:
+                continue
+            frame = load_frame(os.path.join(directory, filename), columns=columns)
+            for position, (column, value) in enumerate(partition.items()):
+                frame.insert(position, column, value)
+            frames.append(frame)
+    
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
@@ -0,0 +1,86 @@
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# 没有参考数据时使用的默认取值，出现频率按 Zipf 分布递减，与真实榜单中少数行业、城市占多数的情况相近
+DEFAULT_INDUSTRIES = [
+    '房地产', '医药', '投资', '半导体', '钢铁', '食品', '金融服务', '锂电池', '电子商务', '互联网服务',
+    '汽车', '化工', '家电制造', '饮料', '软件', '新能源', '光伏', '服装', '建筑', '物流',
+    '调味品', '游戏', '社交媒体', '医疗器械', '有色金属', '教育', '农业', '电力设备', '零售', '酒店',
+]
+DEFAULT_LOCATIONS = [
+    '北京', '上海', '广东深圳', '浙江杭州', '香港', '江苏苏州', '广东广州', '江苏南京', '浙江宁波', '山东青岛',
+    '福建厦门', '四川成都', '湖北武汉', '广东佛山', '天津', '重庆', '江苏无锡', '浙江绍兴', '福建泉州', '湖南长沙',
+    '河南郑州', '辽宁大连', '陕西西安', '安徽合肥', '台湾', '新加坡', '浙江温州', '广东东莞', '山东济南', '江西南昌',
+]
+GENDER_WEIGHTS = {'先生': 0.943, '女士': 0.036, '未知': 0.021}
+EDUCATION_WEIGHTS = {'本科': 0.155, '硕士': 0.148, '博士': 0.032, '未知': 0.665}
+
+
+def _zipf_weights(values, exponent: float = 1.0) -> Dict:
+    weights = 1.0 / np.arange(1, len(values) + 1) ** exponent
+    return dict(zip(values, weights / weights.sum()))
+
+
+def reference_weights(reference: pd.DataFrame, column: str) -> Dict:
+    # 从真实数据（如 hurun_raw_data.csv）统计某列各取值的出现频率
+    counts = reference[column].dropna().value_counts(normalize=True)
+    return counts.to_dict()
+
+
+def _sample(rng: np.random.Generator, weights: Dict, size: int) -> np.ndarray:
+    # 先按概率抽取编码，再取出共享的字符串对象，千万行时也只占用指针大小的内存
+    values = np.array(list(weights), dtype=object)
+    probabilities = np.array(list(weights.values()), dtype='float64')
+    codes = rng.choice(len(values), size=size, p=probabilities / probabilities.sum())
+    return values[codes]
+
+
+def generate_rankings(n_rows: int, seed: int = 0, reference: Optional[pd.DataFrame] = None,
+                      wealth_min: float = 50.0, wealth_max: float = 4000.0, wealth_alpha: float = 1.2,
+                      unknown_age_ratio: float = 0.12) -> pd.DataFrame:
+    # 生成与采集结果列结构一致的模拟榜单：
+    # 财富服从 [wealth_min, wealth_max] 上的截断帕累托分布（长尾但最大值有界），年龄近似正态分布，部分年龄为"未知"
+    # reference 为真实榜单数据时，行业、地区、性别、学历按其中的频率抽样
+    rng = np.random.default_rng(seed)
+
+    if reference is not None:
+        industries = reference_weights(reference, 'industry')
+        locations = reference_weights(reference, 'headquarters')
+        genders = reference_weights(reference, 'gender')
+        educations = reference_weights(reference.fillna({'education': '未知'}), 'education')
+    else:
+        industries = _zipf_weights(DEFAULT_INDUSTRIES)
+        locations = _zipf_weights(DEFAULT_LOCATIONS)
+        genders = GENDER_WEIGHTS
+        educations = EDUCATION_WEIGHTS
+
+    # 截断帕累托分布的逆分布函数采样
+    tail = 1 - (wealth_min / wealth_max) ** wealth_alpha
+    wealth = np.round(wealth_min / (1 - rng.random(n_rows) * tail) ** (1 / wealth_alpha))
+    order = np.argsort(-wealth, kind='stable')
+    wealth = wealth[order]
+
+    age_labels = np.array([str(age) for age in range(120)] + ['未知'], dtype=object)
+    ages = np.clip(np.round(rng.normal(61, 11, n_rows)), 25, 100).astype('int64')
+    ages[rng.random(n_rows) < unknown_age_ratio] = len(age_labels) - 1
+
+    # 同样的财富并列同一名次
+    ranking = pd.Series(wealth).rank(method='min', ascending=False).astype('int64').to_numpy()
+    ids = pd.RangeIndex(n_rows).astype(str)
+    headquarters = _sample(rng, locations, n_rows)
+
+    return pd.DataFrame({
+        'ranking': ranking,
+        'name': '富豪' + ids,
+        'wealth': wealth,
+        'company': '公司' + ids,
+        'headquarters': headquarters,
+        'industry': _sample(rng, industries, n_rows),
+        'gender': _sample(rng, genders, n_rows),
+        'age': age_labels[ages],
+        'birth_place': _sample(rng, locations, n_rows),
+        'permanent_place': headquarters,
+        'education': _sample(rng, educations, n_rows),
+    })
@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pandas as pd
+
+# 从 Homework1 目录导入 src 包
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.data_collector import DataCollector, normalize_rows
+
+
+ROWS = [
+    # 字段存在但值为 null
+    {'hs_Rank_Rich_Ranking': 1, 'hs_Rank_Rich_ChaName_Cn': None, 'hs_Rank_Rich_Wealth': None,
+     'hs_Character': [{'hs_Character_Gender': None, 'hs_Character_Age': '50'}]},
+    # 缺少字段
+    {'hs_Rank_Rich_Ranking': 2, 'hs_Rank_Rich_ChaName_Cn': '张三', 'hs_Rank_Rich_Wealth': 100.0},
+    # 没有人物信息
+    {'hs_Rank_Rich_Ranking': 3, 'hs_Rank_Rich_Wealth': 50.0, 'hs_Character': []},
+]
+
+
+def process_items(rows):
+    collector = DataCollector.__new__(DataCollector)
+    return pd.DataFrame([collector._process_data_item(row) for row in rows])
+
+
+def test_null_values_are_kept():
+    frame = normalize_rows(ROWS)
+    assert pd.isna(frame.at[0, 'name'])
+    assert pd.isna(frame.at[0, 'wealth'])
+    assert pd.isna(frame.at[0, 'gender'])
+    assert frame.at[0, 'age'] == '50'
+
+
+def test_missing_fields_get_defaults():
+    frame = normalize_rows(ROWS)
+    assert frame.at[1, 'company'] == '未知'
+    assert frame.at[1, 'gender'] == '未知'
+    assert frame.at[2, 'name'] == '未知'
+    assert frame.at[2, 'birthday'] == ''
+
+
+def test_batch_matches_per_item_csv():
+    assert normalize_rows(ROWS).to_csv(index=False) == process_items(ROWS).to_csv(index=False)
+
+
+def test_ranking_stays_integer_without_nulls():
+    frame = normalize_rows(ROWS[1:])
+    assert frame['ranking'].dtype == 'int64'
@@ -1,14 +1,99 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 import pandas as pd
 import time
 import random
 import os
+import sys
+import threading
+import argparse
+import calendar
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlparse
 from fake_useragent import UserAgent
 
+# 共用的 HTTP 缓存模块位于仓库根目录的 common 包中
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.http_cache import HttpCache
+from weather_parser import BACKENDS, parse_month_page
+
+
+# 常用城市代码与中文名，代码即天气后报网站 URL 中的城市拼音
+CITY_NAMES = {
+    'dalian': '大连',
+    'beijing': '北京',
+    'shanghai': '上海',
+    'guangzhou': '广州',
+    'shenzhen': '深圳',
+    'hangzhou': '杭州',
+    'nanjing': '南京',
+    'shenyang': '沈阳',
+    'qingdao': '青岛',
+    'tianjin': '天津',
+    'chengdu': '成都',
+    'wuhan': '武汉',
+    'xian': '西安',
+    'chongqing': '重庆',
+    'haerbin': '哈尔滨',
+}
+
+# 原始记录的列，all_data 中每条记录为 [城市代码, 日期, 天气, 气温, 风力风向]
+RAW_COLUMNS = ['city', 'date', 'weather', 'temperature', 'wind']
+
+# 有效日期的格式，如 2024年01月05日；页面表格中的空白行日期为空字符串，读回时为 NaN
+DATE_PATTERN = r'\d{4}年\d{2}月\d{2}日'
+
+
+def has_date(dates):
+    """返回日期列中各行是否为有效日期的布尔序列"""
+    return dates.astype(str).str.match(DATE_PATTERN)
+
+
+def month_range(start, end):
+    """按时间顺序列出 [start, end] 区间内的所有 (年, 月)"""
+    (year, month), months = start, []
+    while (year, month) <= end:
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+class HostLimiter:
+    """按主机限制访问频率：同一主机同时在途的请求不超过 max_in_flight 个，
+    相邻两次请求的发出时间至少间隔 min_interval 秒（另加 0~jitter 秒的随机抖动）"""
+
+    def __init__(self, max_in_flight=2, min_interval=1.0, jitter=0.5):
+        self.max_in_flight = max_in_flight
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.lock = threading.Lock()
+        self.semaphores = {}
+        self.next_start = {}
+
+    @contextmanager
+    def slot(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            semaphore = self.semaphores.setdefault(host, threading.Semaphore(self.max_in_flight))
+        with semaphore:
+            # 预约下一个可用的发送时间，再在锁外等待，其他线程可以继续预约之后的时间
+            with self.lock:
+                now = time.monotonic()
+                start = max(now, self.next_start.get(host, now))
+                self.next_start[host] = start + self.min_interval + random.uniform(0, self.jitter)
+            if start > now:
+                time.sleep(start - now)
+            yield
+
 
 class WeatherSpider:
-    def __init__(self):
+    def __init__(self, cities=None, start=None, end=None, max_workers=4, max_in_flight=2, min_interval=1.0,
+                 parser_backend=None):
+        """
+        cities：城市代码列表，默认只有大连；start / end：(年, 月)，默认从三年前的一月到当前月份
+        parser_backend：页面解析后端（见 weather_parser.BACKENDS），默认使用已安装的最快后端
+        """
         self.base_url = "https://www.tianqihoubao.com"
         self.ua = UserAgent()
         self.headers = {
@@ -18,126 +103,213 @@ class WeatherSpider:
             'Connection': 'keep-alive'
         }
         self.city_code = "dalian"  # 大连市的代码，需要根据实际网站结构确认
+        self.cities = list(cities) if cities else [self.city_code]
+        now = time.localtime()
+        self.start = tuple(start) if start else (now.tm_year - 3, 1)
+        self.end = tuple(end) if end else (now.tm_year, now.tm_mon)
         self.all_data = []
         self.current_attempts = 0
         self.max_attempts = 3  # 每个页面的最大重试次数
+        self.parser_backend = parser_backend
 
         # 创建数据保存目录
         self.data_dir = os.path.join(os.getcwd(), "weather_data")
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
 
-    def fetch_weather(self, year, month):
-        """获取指定年月的天气数据，增加重试机制和详细日志"""
-        url = f"{self.base_url}/lishi/{self.city_code}/month/{year}{month:02d}.html"
-        print(f"正在获取 {year}年{month}月 大连天气数据: {url}")
+        # 历史月份的页面不会再变化，缓存后重复运行无需访问网络
+        self.cache = HttpCache(os.path.join(self.data_dir, "http_cache"))
+        self.current_month_max_age = 6 * 3600  # 当月页面仍会更新，缓存6小时后重新验证
+
+        # 所有请求共用一个保持长连接的会话，并发抓取时由 HostLimiter 控制访问频率
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(self.headers)
+        self.limiter = HostLimiter(max_in_flight=max_in_flight, min_interval=min_interval)
+
+    def cache_max_age(self, year, month):
+        """历史月份永久有效，当月（及以后）的页面使用较短的新鲜期"""
+        now = time.localtime()
+        if (year, month) < (now.tm_year, now.tm_mon):
+            return None
+        return self.current_month_max_age
+
+    def city_name(self, city_code):
+        return CITY_NAMES.get(city_code, city_code)
+
+    def fetch_weather(self, year, month, city_code=None):
+        """获取指定城市、年月的天气数据并追加到 all_data，返回是否成功"""
+        city_code = city_code or self.city_code
+        month_data = self.fetch_month(year, month, city_code)
+        if month_data:
+            self.all_data.extend([city_code] + row for row in month_data)
+        return bool(month_data)
+
+    def fetch_month(self, year, month, city_code=None):
+        """获取指定城市、年月的天气数据，返回该月的记录列表，失败时返回 None；可在多个线程中同时调用"""
+        city_code = city_code or self.city_code
+        url = f"{self.base_url}/lishi/{city_code}/month/{year}{month:02d}.html"
+        print(f"正在获取 {year}年{month}月 {self.city_name(city_code)}天气数据: {url}")
+
+        max_age = self.cache_max_age(year, month)
 
         for attempt in range(self.max_attempts):
             try:
-                # 每次请求前随机延迟，避免请求过于频繁
-                wait_time = random.uniform(2, 5)
-                print(f"等待 {wait_time:.2f} 秒后发送请求...")
-                time.sleep(wait_time)
-
-                response = requests.get(url, headers=self.headers, timeout=15)
+                # 命中缓存时不访问网络，无需等待；否则由 HostLimiter 控制同一主机的并发数和请求间隔
+                if self.cache.is_fresh(url, max_age=max_age):
+                    response = self.cache.get(url, session=self.session, max_age=max_age, timeout=15)
+                else:
+                    with self.limiter.slot(url):
+                        response = self.cache.get(url, session=self.session, max_age=max_age, timeout=15)
                 response.raise_for_status()
                 response.encoding = 'utf-8'
 
                 # 验证响应内容是否包含天气数据
                 if "404 Not Found" in response.text or "没有找到" in response.text:
                     print(f"警告: 页面 {url} 返回空内容或404错误")
-                    return False
-
-                soup = BeautifulSoup(response.text, 'html.parser')
-
-                # 尝试多种方式定位天气表格
-                table = soup.find('table', class_='b')
-                if not table:
-                    # 备选定位方式
-                    table = soup.find('table', class_='table0')
-
-                if not table:
-                    # 更通用的定位方式
-                    tables = soup.find_all('table')
-                    if tables:
-                        # 选择行数最多的表格作为天气表格
-                        table = max(tables, key=lambda t: len(t.find_all('tr')))
-                    else:
-                        print(f"错误: 在 {url} 中未找到任何表格")
-                        return False
-
-                # 解析表格数据
-                rows = table.find_all('tr')[1:]  # 跳过表头
-                if not rows:
-                    print(f"警告: 在 {url} 中找到表格但没有数据行")
-                    return False
-
-                month_data = []
-                for row in rows:
-                    cols = row.find_all('td')
-                    if len(cols) >= 4:
-                        date = cols[0].text.strip()
-                        weather = cols[1].text.strip()
-                        temp = cols[2].text.strip()
-                        wind = cols[3].text.strip()
-
-                        month_data.append([date, weather, temp, wind])
+                    return None
+
+                # 定位天气表格并解析各行（日期、天气状况、气温、风力风向），跳过表头
+                month_data = parse_month_page(response.text, self.parser_backend)
+                if month_data is None:
+                    print(f"错误: 在 {url} 中未找到天气表格")
+                    return None
 
                 if month_data:
-                    self.all_data.extend(month_data)
                     print(f"成功获取 {year}年{month}月 数据，共 {len(month_data)} 条记录")
-                    return True
+                    return month_data
                 else:
                     print(f"警告: 在 {url} 中未找到有效天气数据")
-                    return False
+                    return None
 
             except requests.RequestException as e:
                 print(f"请求异常 (尝试 {attempt + 1}/{self.max_attempts}): {e}")
                 if attempt == self.max_attempts - 1:
                     print(f"错误: 达到最大重试次数，跳过 {year}年{month}月")
-                    return False
+                    return None
                 time.sleep(5)  # 重试前等待更长时间
             except Exception as e:
                 print(f"处理异常 (尝试 {attempt + 1}/{self.max_attempts}): {e}")
                 if attempt == self.max_attempts - 1:
                     print(f"错误: 达到最大重试次数，跳过 {year}年{month}月")
-                    return False
+                    return None
                 time.sleep(5)
 
-        return False
-
-    def run(self):
-        """运行爬虫主程序，增加数据验证和结果保存"""
-        print("开始爬取大连市近三年天气数据...")
-
-        # 获取当前年份和月份
-        current_year = time.localtime().tm_year
-        current_month = time.localtime().tm_mon
-
-        # 计算前三年加今年的年份范围
-        years = list(range(current_year - 3, current_year + 1))
-        # years = [2022, 2023, 2024，2025]
-
-        # 记录成功和失败的月份
-        success_months = 0
-        failed_months = 0
-
-        # 遍历每个月
-        for year in years:
-            # 对于当前年份，只爬取到当前月份
-            end_month = current_month if year == current_year else 12
+        return None
+
+    def load_existing(self):
+        """读取已保存的数据：分区数据集，以及尚未迁移到数据集中的 dalian_weather_data.csv"""
+        dataset_dir = os.path.join(self.data_dir, 'dataset')
+        frames = []
+        if os.path.isdir(dataset_dir):
+            for city_dir in sorted(os.listdir(dataset_dir)):
+                if not city_dir.startswith('city='):
+                    continue
+                for year_dir in sorted(os.listdir(os.path.join(dataset_dir, city_dir))):
+                    path = os.path.join(dataset_dir, city_dir, year_dir, 'part.csv')
+                    if os.path.exists(path):
+                        frame = pd.read_csv(path, encoding='utf-8-sig')
+                        frame.insert(0, 'city', city_dir[len('city='):])
+                        frames.append(frame)
+        # 分区数据集中还没有大连时，读取原有格式的单个 CSV
+        if not any((frame['city'] == 'dalian').any() for frame in frames):
+            legacy_path = os.path.join(self.data_dir, 'dalian_weather_data.csv')
+            if os.path.exists(legacy_path):
+                frame = pd.read_csv(legacy_path, encoding='utf-8-sig')
+                frame.insert(0, 'city', 'dalian')
+                frames.append(frame)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=RAW_COLUMNS)
+
+    def months_to_fetch(self, existing, months):
+        """返回每个城市需要抓取的月份：本地没有的月份、当月及以后的月份，以及天数不全的上个月；
+        更早的月份页面不会再变化，已有数据时直接跳过"""
+        now = time.localtime()
+        current = (now.tm_year, now.tm_mon)
+        previous = (now.tm_year - 1, 12) if now.tm_mon == 1 else (now.tm_year, now.tm_mon - 1)
+
+        # 每个 (城市, 年, 月) 已有的天数，页面表格中的空白行没有日期，不计入
+        dated = existing[has_date(existing['date'])]
+        dates = dated['date'].astype(str)
+        day_counts = dated.groupby(
+            [dated['city'], dates.str.slice(0, 4).astype(int), dates.str.slice(5, 7).astype(int)]
+        ).size().to_dict()
+
+        pending = {}
+        for city in self.cities:
+            pending[city] = []
+            for year, month in months:
+                days = day_counts.get((city, year, month), 0)
+                incomplete = days < calendar.monthrange(year, month)[1]
+                if days == 0 or (year, month) >= current or ((year, month) == previous and incomplete):
+                    pending[city].append((year, month))
+        return pending
+
+    def merge_records(self, existing, new):
+        """合并已有数据与新抓取的数据，同一城市同一天以新数据为准，结果按城市、日期排序"""
+        merged = pd.concat([existing, new], ignore_index=True)
+        # 页面表格中的空白行没有日期（旧数据读回为 NaN，新抓取的为空字符串），合并时去掉
+        merged = merged[has_date(merged['date'])]
+        merged = merged.drop_duplicates(subset=['city', 'date'], keep='last')
+        return merged.sort_values(['city', 'date'], kind='stable').reset_index(drop=True)
+
+    def run(self, concurrent=True, incremental=True):
+        """运行爬虫主程序：所有城市、月份作为一个任务队列并发抓取，按城市汇报进度，最后按城市/年份分区保存；
+        incremental=True 时只抓取本地缺少或仍可能变化的月份，再与已有数据合并"""
+        city_names = "、".join(self.city_name(city) for city in self.cities)
+        print(f"开始爬取{city_names} {self.start[0]}年{self.start[1]}月至{self.end[0]}年{self.end[1]}月的天气数据...")
+
+        # 按城市、时间顺序列出全部任务
+        months = month_range(self.start, self.end)
+        existing = self.load_existing() if incremental else pd.DataFrame(columns=RAW_COLUMNS)
+        if not existing.empty:
+            pending = self.months_to_fetch(existing, months)
+            tasks = [(city, year, month) for city in self.cities for year, month in pending[city]]
+            print(f"本地已有 {len(existing)} 条记录，需要抓取 {len(tasks)} 个页面"
+                  f"（共 {len(self.cities) * len(months)} 个）")
+        else:
+            tasks = [(city, year, month) for city in self.cities for year, month in months]
+
+        if not tasks:
+            print("数据已是最新，无需抓取")
+            return
 
-            for month in range(1, end_month + 1):
-                success = self.fetch_weather(year, month)
-                if success:
-                    success_months += 1
-                else:
-                    failed_months += 1
+        # 每个城市的完成进度，多个线程同时更新
+        progress = {city: {'done': 0, 'success': 0, 'total': 0} for city in self.cities}
+        for city, _, _ in tasks:
+            progress[city]['total'] += 1
+        progress_lock = threading.Lock()
+
+        def fetch(task):
+            city, year, month = task
+            month_data = self.fetch_month(year, month, city)
+            with progress_lock:
+                progress[city]['done'] += 1
+                if month_data:
+                    progress[city]['success'] += 1
+                print(f"[{self.city_name(city)}] 进度 {progress[city]['done']}/{progress[city]['total']}，"
+                      f"成功 {progress[city]['success']} 个月")
+            return month_data
+
+        if concurrent:
+            # executor.map 按提交顺序返回结果，数据仍按城市、时间顺序写入 all_data
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(fetch, tasks))
+        else:
+            results = [fetch(task) for task in tasks]
+
+        for (city, _, _), month_data in zip(tasks, results):
+            if month_data:
+                self.all_data.extend([city] + row for row in month_data)
 
         # 输出爬取总结
         print("\n===== 爬取总结 =====")
-        print(f"成功获取 {success_months} 个月份的数据")
-        print(f"失败 {failed_months} 个月份的数据")
+        for city in self.cities:
+            success = progress[city]['success']
+            print(f"{self.city_name(city)}：成功获取 {success} 个月份的数据，"
+                  f"失败 {progress[city]['total'] - success} 个月份")
         print(f"总共获取了 {len(self.all_data)} 条天气记录")
 
         # 检查是否有数据
@@ -147,8 +319,18 @@ class WeatherSpider:
 
         # 处理数据
         print("正在处理数据...")
-        columns = ['date', 'weather', 'temperature', 'wind']
-        df = pd.DataFrame(self.all_data, columns=columns)
+        new = self.process_records(self.all_data)
+        # 只重写有新数据的 城市/年份 分区
+        dated = new[has_date(new['date'])]
+        touched = set(zip(dated['city'], dated['date'].str.slice(0, 4)))
+        df = self.merge_records(existing, new) if not existing.empty else new
+        self.save(df, partitions=touched)
+
+    def process_records(self, records):
+        """把原始记录整理为带数值温度、昼夜风力的表格"""
+        df = pd.DataFrame(records, columns=RAW_COLUMNS)
+        # 去掉页面表格中没有日期的空白行，避免分区保存时产生 year= 这样的空分区
+        df = df[has_date(df['date'])].reset_index(drop=True)
 
         # 提取温度数据
         df[['max_temperature', 'min_temperature']] = df['temperature'].str.extract(r'(\d+|\-?\d+)℃ \/ (\d+|\-?\d+)℃')
@@ -159,17 +341,50 @@ class WeatherSpider:
 
         # 提取风力数据
         df[['wind_day', 'wind_night']] = df['wind'].str.extract(r'(.*) \/ (.*)')
+        return df
+
+    def save(self, df, partitions=None):
+        """按 城市/年份 分区保存到 weather_data/dataset，大连的数据另存一份原有格式的 dalian_weather_data.csv；
+        partitions 为 (城市, 年份) 集合时只重写这些分区，以及数据集中还不存在的分区"""
+        dataset_dir = os.path.join(self.data_dir, 'dataset')
+        years = df['date'].astype(str).str.slice(0, 4)
+        for (city, year), part in df.groupby([df['city'], years], sort=True):
+            partition_dir = os.path.join(dataset_dir, f"city={city}", f"year={year}")
+            path = os.path.join(partition_dir, 'part.csv')
+            if partitions is not None and (city, year) not in partitions and os.path.exists(path):
+                continue
+            os.makedirs(partition_dir, exist_ok=True)
+            part.drop(columns=['city']).to_csv(path, index=False, encoding='utf-8-sig')
+        print(f"\n数据已按城市/年份分区保存到: {dataset_dir}")
+
+        # 兼容后续分析脚本：大连数据仍输出为单个 CSV，列与原来一致
+        dalian = df[df['city'] == 'dalian'].drop(columns=['city'])
+        if not dalian.empty:
+            output_path = os.path.join(self.data_dir, 'dalian_weather_data.csv')
+            dalian.to_csv(output_path, index=False, encoding='utf-8-sig')
+            print(f"大连数据已保存到: {output_path}")
 
-        # 保存数据
-        output_path = os.path.join(self.data_dir, 'dalian_weather_data.csv')
-        df.to_csv(output_path, index=False, encoding='utf-8-sig')
-
-        print(f"\n数据已成功保存到: {output_path}")
         print(f"数据包含 {len(df)} 行，{len(df.columns)} 列")
         print("数据前几行预览:")
         print(df.head().to_string())
 
 
+def parse_month(value):
+    """把 2024-01 / 202401 形式的字符串解析为 (年, 月)"""
+    digits = value.replace('-', '')
+    return int(digits[:4]), int(digits[4:6])
+
+
 if __name__ == "__main__":
-    spider = WeatherSpider()
-    spider.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="爬取天气后报网站的历史天气数据")
+    parser.add_argument('--cities', nargs='+', default=None, help="城市代码，如 dalian beijing，默认只爬取大连")
+    parser.add_argument('--start', type=parse_month, default=None, help="起始月份，如 2022-01，默认三年前的一月")
+    parser.add_argument('--end', type=parse_month, default=None, help="结束月份，如 2025-06，默认当前月份")
+    parser.add_argument('--workers', type=int, default=4, help="并发抓取的线程数")
+    parser.add_argument('--full', action='store_true', help="忽略本地已有数据，重新抓取全部月份")
+    parser.add_argument('--parser', choices=BACKENDS, default=None, help="页面解析后端，默认使用已安装的最快后端")
+    args = parser.parse_args()
+
+    spider = WeatherSpider(cities=args.cities, start=args.start, end=args.end, max_workers=args.workers,
+                           parser_backend=args.parser)
+    spider.run(incremental=not args.full)
@@ -3,6 +3,8 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import os
 
+from weather_loader import load_weather
+
 # 设置中文字体支持
 plt.rcParams["font.family"] = ["SimHei", "WenQuanYi Micro Hei", "Heiti TC"]
 plt.rcParams["axes.unicode_minus"] = False  # 解决负号显示问题
@@ -32,30 +34,14 @@ def plot_temperature_trend(
         print("请先运行爬虫程序获取天气数据")
         return
 
-    # 读取数据
+    # 读取数据，日期、年份和月份等派生列由 weather_loader 统一解析并缓存
     try:
-        df = pd.read_csv(data_path)
+        df = load_weather(data_path)
         print(f"成功读取数据，共 {len(df)} 条记录")
     except Exception as e:
         print(f"读取数据时出错: {e}")
         return
 
-    # 数据预处理
-    print("正在处理数据...")
-
-    # 转换日期格式
-    try:
-        df['date'] = pd.to_datetime(df['date'], format='%Y年%m月%d日')
-        print("日期格式转换成功")
-    except Exception as e:
-        print(f"日期格式转换失败: {e}")
-        print("请检查数据中的日期格式是否为 'YYYY年MM月DD日'")
-        return
-
-    # 提取年份和月份
-    df['year'] = df['date'].dt.year
-    df['month'] = df['date'].dt.month
-
     # 筛选2022-2024年的数据
     target_years = [2022, 2023, 2024]
     filtered_df = df[df['year'].isin(target_years)]
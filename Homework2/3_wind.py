@@ -2,6 +2,12 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import sys
+
+# 共用的图表清单模块位于仓库根目录的 common 包中
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.chart_manifest import ChartManifest
+from weather_loader import load_weather
 
 # 设置中文字体支持，确保图表中文显示正常
 plt.rcParams["font.family"] = ["SimHei", "WenQuanYi Micro Hei", "Heiti TC"]
@@ -21,61 +27,22 @@ def plot_wind_distribution(data_path=r"E:\Users\lzr20\PycharmProjects\pythonProj
         print("请先运行爬虫程序获取天气数据")
         return
 
-    # 读取数据
+    # 读取数据，日期、年月和昼夜风力等级（max_wind_level 为两者较大值）由 weather_loader 统一解析并缓存
     try:
-        df = pd.read_csv(data_path)
+        df = load_weather(data_path)
         print(f"成功读取数据，共 {len(df)} 条记录")
     except Exception as e:
         print(f"读取数据时出错: {e}")
         return
 
-    # 数据预处理
-    print("正在处理数据...")
-
-    # 转换日期格式，按“年-月-日”格式解析
-    try:
-        df['date'] = pd.to_datetime(df['date'], format='%Y年%m月%d日')
-        print("日期格式转换成功")
-    except Exception as e:
-        print(f"日期格式转换失败: {e}")
-        print("请检查数据中的日期格式是否为 'YYYY年MM月DD日'")
-        return
-
-    # 提取年份和月份信息，方便后续分组统计
-    df['year'] = df['date'].dt.year
-    df['month'] = df['date'].dt.month
-
     # 筛选2022-2024年的数据，限定分析时间范围
     target_years = [2022, 2023, 2024]
-    filtered_df = df[df['year'].isin(target_years)]
+    filtered_df = df[df['year'].isin(target_years)].copy()
 
     if filtered_df.empty:
         print("错误: 数据中不包含2022-2024年的记录")
         return
 
-    # 从wind_day和wind_night中提取风力等级，处理带“级”的文本
-    def extract_wind_level(wind_str):
-        if pd.isna(wind_str):
-            return np.nan
-        try:
-            if '级' in wind_str:
-                # 处理“X-X级”格式，取较大值；处理“X级”格式，直接取数值
-                if '-' in wind_str:
-                    return int(wind_str.split('-')[1].replace('级', ''))
-                else:
-                    return int(wind_str.replace('级', ''))
-            else:
-                return np.nan
-        except:
-            return np.nan
-
-    # 提取白天和夜间的风力等级
-    filtered_df['wind_level_day'] = filtered_df['wind_day'].apply(extract_wind_level)
-    filtered_df['wind_level_night'] = filtered_df['wind_night'].apply(extract_wind_level)
-
-    # 计算每天的最高风力等级，取白天和夜间的最大值
-    filtered_df['max_wind_level'] = filtered_df[['wind_level_day', 'wind_level_night']].max(axis=1)
-
     # 定义风力等级区间，划分不同风力等级
     wind_bins = [0, 3, 5, 7, 10, np.inf]
     wind_labels = ['0-3级', '4-5级', '6-7级', '8-10级', '10级以上']
@@ -95,6 +62,8 @@ def plot_wind_distribution(data_path=r"E:\Users\lzr20\PycharmProjects\pythonProj
     output_dir = "weather_plots/wind"
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
+    # 记录每张图的输入哈希，输入未变化的图不再重新渲染
+    manifest = ChartManifest(output_dir)
 
     # 为每个月创建饼图
     for year in target_years:
@@ -104,6 +73,13 @@ def plot_wind_distribution(data_path=r"E:\Users\lzr20\PycharmProjects\pythonProj
                 if wind_data.sum() == 0:
                     continue  # 跳过无数据的月份
 
+                # 输入数据与上次渲染时相同则跳过
+                plot_path = os.path.join(output_dir, f'wind_{year}_{month:02d}.png')
+                chart_key = ChartManifest.compute_key(wind_data, {'chart': 'wind_month', 'year': year, 'month': month})
+                if manifest.is_fresh(plot_path, chart_key):
+                    print(f'{year}年{month}月 风力分布图输入未变化，跳过: {plot_path}')
+                    continue
+
                 # 智能标签：占比小于3%时不显示百分比，避免重叠
                 def autopct_format(pct):
                     return f'{pct:.1f}%' if pct >= 3 else ''
@@ -134,15 +110,22 @@ def plot_wind_distribution(data_path=r"E:\Users\lzr20\PycharmProjects\pythonProj
                 plt.tight_layout()  # 自动优化布局，避免标题、图例重叠
 
                 # 保存图表，按年月命名
-                plot_path = os.path.join(output_dir, f'wind_{year}_{month:02d}.png')
                 plt.savefig(plot_path, dpi=300, bbox_inches='tight')
                 plt.close()
                 print(f'已生成 {year}年{month}月 风力分布图: {plot_path}')
+                manifest.record(plot_path, chart_key)
 
     # 为每年创建汇总饼图
     for year in target_years:
         yearly_wind_data = monthly_wind_counts.loc[year].sum()  # 按年汇总风力数据
 
+        # 输入数据与上次渲染时相同则跳过
+        plot_path = os.path.join(output_dir, f'wind_{year}_summary.png')
+        chart_key = ChartManifest.compute_key(yearly_wind_data, {'chart': 'wind_year', 'year': year})
+        if manifest.is_fresh(plot_path, chart_key):
+            print(f'{year}年 风力分布汇总图输入未变化，跳过: {plot_path}')
+            continue
+
         # 智能标签，占比小于3%不显示百分比
         def autopct_format(pct):
             return f'{pct:.1f}%' if pct >= 3 else ''
@@ -173,10 +156,10 @@ def plot_wind_distribution(data_path=r"E:\Users\lzr20\PycharmProjects\pythonProj
         plt.tight_layout()
 
         # 保存汇总图表
-        plot_path = os.path.join(output_dir, f'wind_{year}_summary.png')
         plt.savefig(plot_path, dpi=300, bbox_inches='tight')
         plt.close()
         print(f'已生成 {year}年 风力分布汇总图: {plot_path}')
+        manifest.record(plot_path, chart_key)
 
     print(f"\n所有风力分布图已保存到目录: {output_dir}")
 
@@ -2,6 +2,12 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+import sys
+
+# 共用的图表清单模块位于仓库根目录的 common 包中
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.chart_manifest import ChartManifest
+from weather_loader import count_weather_pairs, load_weather
 
 # 设置中文字体
 plt.rcParams["font.family"] = ["SimHei", "Microsoft YaHei"]
@@ -18,25 +24,14 @@ def plot_weather_heatmap(data_path="weather_data/dalian_weather_data.csv"):
         print(f"错误：未找到数据文件 {data_path}")
         return
 
-    # 读取数据
+    # 读取数据，日期、年月以及按斜杠拆分的白天/夜间天气由 weather_loader 统一解析并缓存
     try:
-        df = pd.read_csv(data_path)
+        df = load_weather(data_path)
         print(f"成功读取 {len(df)} 条数据")
     except Exception as e:
         print(f"读取数据失败：{e}")
         return
 
-    # 转换日期格式
-    try:
-        df["date"] = pd.to_datetime(df["date"], format="%Y年%m月%d日")
-    except Exception as e:
-        print(f"日期转换失败：{e}")
-        return
-
-    # 提取年份和月份
-    df["year"] = df["date"].dt.year
-    df["month"] = df["date"].dt.month
-
     # 筛选2022-2024年数据
     target_years = [2022, 2023, 2024]
     filtered_df = df[df["year"].isin(target_years)]
@@ -53,6 +48,8 @@ def plot_weather_heatmap(data_path="weather_data/dalian_weather_data.csv"):
     # 创建保存目录
     output_dir = "weather_plots/weather"
     os.makedirs(output_dir, exist_ok=True)
+    # 记录每张图的输入哈希，输入未变化的图不再重新渲染
+    manifest = ChartManifest(output_dir)
 
     # 1. 月度热力图
     for year in target_years:
@@ -63,27 +60,8 @@ def plot_weather_heatmap(data_path="weather_data/dalian_weather_data.csv"):
                 print(f"警告：{year}年{month}月无数据，跳过")
                 continue
 
-            # 初始化天气组合计数器
-            weather_combinations = {}
-
-            # 统计每种天气组合出现的次数
-            for _, row in month_data.iterrows():
-                weather_str = row[weather_col]
-                if pd.isna(weather_str):
-                    continue
-
-                # 按斜杠拆分天气（如"多云 / 晴"拆分为["多云", "晴"]）
-                weathers = [w.strip() for w in weather_str.split('/') if w.strip()]
-
-                if len(weathers) >= 2:
-                    # 天气1作为横坐标，天气2作为纵坐标
-                    weather1 = weathers[0]
-                    weather2 = weathers[1]
-
-                    # 更新组合计数
-                    if (weather1, weather2) not in weather_combinations:
-                        weather_combinations[(weather1, weather2)] = 0
-                    weather_combinations[(weather1, weather2)] += 1
+            # 统计每种天气组合（白天天气, 夜间天气）出现的次数，只有一种天气的记录不计入
+            weather_combinations = count_weather_pairs(month_data)
 
             # 如果没有有效的天气组合，跳过绘图
             if not weather_combinations:
@@ -100,6 +78,13 @@ def plot_weather_heatmap(data_path="weather_data/dalian_weather_data.csv"):
             for (weather1, weather2), count in weather_combinations.items():
                 matrix_df.loc[weather2, weather1] = count  # 天气2作为纵坐标，天气1作为横坐标
 
+            # 输入数据与上次渲染时相同则跳过
+            save_path = os.path.join(output_dir, f"weather_{year}_{month:02d}.png")
+            chart_key = ChartManifest.compute_key(matrix_df, {'chart': 'weather_month', 'year': year, 'month': month})
+            if manifest.is_fresh(save_path, chart_key):
+                print(f"{year}年{month}月天气组合热力图输入未变化，跳过：{save_path}")
+                continue
+
             # 绘制热力图
             plt.figure(figsize=(max(10, len(all_weathers) * 0.8), max(8, len(all_weathers) * 0.6)))
             ax = sns.heatmap(
@@ -123,10 +108,10 @@ def plot_weather_heatmap(data_path="weather_data/dalian_weather_data.csv"):
             plt.tight_layout()
 
             # 保存图片
-            save_path = os.path.join(output_dir, f"weather_{year}_{month:02d}.png")
             plt.savefig(save_path)
             plt.close()
             print(f"已生成 {year}年{month}月天气组合热力图：{save_path}")
+            manifest.record(save_path, chart_key)
 
     # 2. 年度汇总热力图
     for year in target_years:
@@ -136,24 +121,8 @@ def plot_weather_heatmap(data_path="weather_data/dalian_weather_data.csv"):
             print(f"警告：{year}年无数据，跳过")
             continue
 
-        # 初始化年度天气组合计数器
-        yearly_combinations = {}
-
         # 统计全年天气组合
-        for _, row in year_data.iterrows():
-            weather_str = row[weather_col]
-            if pd.isna(weather_str):
-                continue
-
-            weathers = [w.strip() for w in weather_str.split('/') if w.strip()]
-
-            if len(weathers) >= 2:
-                weather1 = weathers[0]
-                weather2 = weathers[1]
-
-                if (weather1, weather2) not in yearly_combinations:
-                    yearly_combinations[(weather1, weather2)] = 0
-                yearly_combinations[(weather1, weather2)] += 1
+        yearly_combinations = count_weather_pairs(year_data)
 
         if not yearly_combinations:
             print(f"警告：{year}年无有效天气组合数据，跳过")
@@ -169,6 +138,13 @@ def plot_weather_heatmap(data_path="weather_data/dalian_weather_data.csv"):
         for (weather1, weather2), count in yearly_combinations.items():
             yearly_matrix_df.loc[weather2, weather1] = count
 
+        # 输入数据与上次渲染时相同则跳过
+        save_path = os.path.join(output_dir, f"weather_{year}_summary.png")
+        chart_key = ChartManifest.compute_key(yearly_matrix_df, {'chart': 'weather_year', 'year': year})
+        if manifest.is_fresh(save_path, chart_key):
+            print(f"{year}年天气组合汇总热力图输入未变化，跳过：{save_path}")
+            continue
+
         # 绘制年度热力图
         plt.figure(figsize=(max(12, len(all_weathers_yearly) * 0.8), max(10, len(all_weathers_yearly) * 0.6)))
         ax = sns.heatmap(
@@ -188,10 +164,10 @@ def plot_weather_heatmap(data_path="weather_data/dalian_weather_data.csv"):
         plt.tight_layout()
 
         # 保存年度图
-        save_path = os.path.join(output_dir, f"weather_{year}_summary.png")
         plt.savefig(save_path)
         plt.close()
         print(f"已生成 {year}年天气组合汇总热力图：{save_path}")
+        manifest.record(save_path, chart_key)
 
     print(f"\n所有天气组合热力图已保存至 {output_dir}")
 
@@ -1,6 +1,12 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import os
+import sys
+
+# 共用的图表清单模块位于仓库根目录的 common 包中
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.chart_manifest import ChartManifest
+from weather_loader import load_weather
 
 # 设置中文字体，解决中文显示问题
 plt.rcParams["font.family"] = ["SimHei", "Microsoft YaHei"]
@@ -19,26 +25,14 @@ def plot_weather_distribution(data_path="weather_data/dalian_weather_data.csv"):
         print(f"错误：未找到数据文件 {data_path}，请先运行爬虫程序")
         return
 
-    # 读取数据
+    # 读取数据，日期、年份和月份等派生列由 weather_loader 统一解析并缓存
     try:
-        df = pd.read_csv(data_path)
+        df = load_weather(data_path)
         print(f"成功读取 {len(df)} 条数据")
     except Exception as e:
         print(f"读取数据失败：{e}")
         return
 
-    # 转换日期格式
-    try:
-        df["date"] = pd.to_datetime(df["date"], format="%Y年%m月%d日")
-        print("日期格式转换成功")
-    except Exception as e:
-        print(f"日期转换失败：{e}，请检查日期格式是否为 'YYYY年MM月DD日'")
-        return
-
-    # 提取年份和月份
-    df["year"] = df["date"].dt.year
-    df["month"] = df["date"].dt.month
-
     # 筛选2022-2024年数据
     target_years = [2022, 2023, 2024]
     filtered_df = df[df["year"].isin(target_years)]
@@ -47,7 +41,7 @@ def plot_weather_distribution(data_path="weather_data/dalian_weather_data.csv"):
         return
 
     # 优化天气状况提取：直接取原始天气描述（若需拆分“转”天气，可根据需求调整）
-    # 如需拆分白天/夜间天气，可改为：df["weather"] = df["weather"].str.split("转").str[0]（示例）
+    # 如需按白天/夜间天气统计，可改用 load_weather 拆分好的 weather_day / weather_night 列
     # 这里简化为直接使用原始天气描述统计
     weather_col = "weather"  # 假设CSV中有“weather”列存储天气状况
 
@@ -57,6 +51,8 @@ def plot_weather_distribution(data_path="weather_data/dalian_weather_data.csv"):
     # 创建图表保存目录
     output_dir = "weather_plots/weather"
     os.makedirs(output_dir, exist_ok=True)
+    # 记录每张图的输入哈希，输入未变化的图不再重新渲染
+    manifest = ChartManifest(output_dir)
 
     # 为每个月绘制柱状图
     for year in target_years:
@@ -66,6 +62,13 @@ def plot_weather_distribution(data_path="weather_data/dalian_weather_data.csv"):
             if month_data.empty:
                 continue  # 无数据则跳过
 
+            # 输入数据与上次渲染时相同则跳过
+            save_path = os.path.join(output_dir, f"weather_original_{year}_{month:02d}.png")
+            chart_key = ChartManifest.compute_key(month_data.reset_index(drop=True), {'chart': 'weather_original_month', 'year': year, 'month': month})
+            if manifest.is_fresh(save_path, chart_key):
+                print(f"{year}年{month}月 天气分布柱状图输入未变化，跳过：{save_path}")
+                continue
+
             # 绘制柱状图
             plt.figure(figsize=(10, 6))
             bars = plt.bar(
@@ -98,14 +101,22 @@ def plot_weather_distribution(data_path="weather_data/dalian_weather_data.csv"):
             plt.tight_layout()
 
             # 保存图表
-            save_path = os.path.join(output_dir, f"weather_original_{year}_{month:02d}.png")
             plt.savefig(save_path)
             plt.close()
             print(f"已生成 {year}年{month}月 天气分布柱状图：{save_path}")
+            manifest.record(save_path, chart_key)
 
     # 绘制年度汇总柱状图（可选，如需可取消注释）
     for year in target_years:
         yearly_data = monthly_weather[monthly_weather["year"] == year].groupby(weather_col)["days"].sum().reset_index()
+
+        # 输入数据与上次渲染时相同则跳过
+        save_path = os.path.join(output_dir, f"weather_original_{year}_summary.png")
+        chart_key = ChartManifest.compute_key(yearly_data, {'chart': 'weather_original_year', 'year': year})
+        if manifest.is_fresh(save_path, chart_key):
+            print(f"{year}年 天气分布汇总图输入未变化，跳过：{save_path}")
+            continue
+
         plt.figure(figsize=(12, 7))
         plt.bar(yearly_data[weather_col], yearly_data["days"], color="#FFA07A", edgecolor="black")
         plt.title(f"{year}年大连市天气状况分布汇总", fontsize=16, pad=20)
@@ -113,10 +124,10 @@ def plot_weather_distribution(data_path="weather_data/dalian_weather_data.csv"):
         plt.ylabel("总天数", fontsize=13)
         plt.xticks(rotation=45, ha="right", fontsize=11)
         plt.tight_layout()
-        save_path = os.path.join(output_dir, f"weather_original_{year}_summary.png")
         plt.savefig(save_path)
         plt.close()
         print(f"已生成 {year}年 天气分布汇总图：{save_path}")
+        manifest.record(save_path, chart_key)
 
     print(f"\n所有图表已保存至 {output_dir}")
 
@@ -5,6 +5,8 @@ from statsmodels.tsa.arima.model import ARIMA
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 import os
 
+from weather_loader import load_weather
+
 # 设置中文字体支持
 plt.rcParams["font.family"] = ["SimHei", "WenQuanYi Micro Hei", "Heiti TC"]
 plt.rcParams["axes.unicode_minus"] = False  # 解决负号显示问题
@@ -22,14 +24,6 @@ plt.rcParams["xtick.labelsize"] = 10  # x轴标签字体
 plt.rcParams["ytick.labelsize"] = 11  # y轴标签字体
 
 
-def process_data(df):
-    """数据预处理，提取年份、月份并计算每月平均气温"""
-    df['date'] = pd.to_datetime(df['date'], format='%Y年%m月%d日')
-    df['year'] = df['date'].dt.year
-    df['month'] = df['date'].dt.month
-    return df
-
-
 def train_arima(time_series):
     """训练ARIMA模型，优先尝试季节性模型"""
     try:
@@ -52,16 +46,14 @@ def plot_temperature_trend(data_path=r"E:\Users\lzr20\PycharmProjects\pythonProj
         print(f"错误: 数据文件 '{data_path}' 不存在")
         return
 
+    # 日期、年份和月份等派生列由 weather_loader 统一解析并缓存
     try:
-        df = pd.read_csv(data_path)
+        df = load_weather(data_path)
         print(f"成功读取 {len(df)} 条数据")
     except Exception as e:
         print(f"数据读取失败: {e}")
         return
 
-    # 数据预处理
-    df = process_data(df)
-
     # 历史数据（2022-2024年）
     train_years = [2022, 2023, 2024]
     train_df = df[df['year'].isin(train_years)]
@@ -0,0 +1,106 @@
+"""
+天气页面解析后端的微基准测试
+
+读取保存的月份页面（--fixtures 指定的目录中的 .html 文件，或 weather_data/http_cache 中缓存的页面），
+都没有时按 dalian_weather_data.csv 生成与网站结构相近的页面。
+先检查各后端的解析结果与 bs4 一致，再分别计时。
+
+用法：python benchmarks/bench_parser.py [--fixtures 目录] [--repeat 5] [--backends builtin bs4]
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+HOMEWORK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(HOMEWORK_DIR)
+
+from weather_parser import available_backends, parse_month_page
+
+DATA_DIR = os.path.join(HOMEWORK_DIR, 'weather_data')
+
+
+def load_fixture_pages(fixtures_dir=None):
+    """读取保存的页面：优先读取 fixtures_dir 下的 .html 文件，其次读取 HTTP 缓存中的页面正文"""
+    if fixtures_dir:
+        paths = sorted(glob.glob(os.path.join(fixtures_dir, '*.html')))
+    else:
+        paths = sorted(glob.glob(os.path.join(DATA_DIR, 'http_cache', '*.body')))
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            pages.append(f.read().decode('utf-8', errors='replace'))
+    return pages
+
+
+def synthesize_pages(csv_file):
+    """按已保存的天气数据生成月份页面：导航表格在前，天气数据在 class 为 b 的表格中，日期带链接"""
+    df = pd.read_csv(csv_file, encoding='utf-8-sig').dropna(subset=['date'])
+    months = df['date'].str.slice(0, 8)
+    nav_links = ''.join(f'<td><a href="/lishi/{city}.html">{city}</a></td>'
+                        for city in ['dalian', 'beijing', 'shanghai', 'guangzhou'])
+    pages = []
+    for _, month_df in df.groupby(months, sort=True):
+        rows = ''.join(
+            f'<tr>\n<td>\n<a href="/lishi/dalian/{i}.html" title="{row.date}大连天气预报">{row.date}</a>\n</td>'
+            f'\n<td>{row.weather}\n</td>\n<td>{row.temperature}\n</td>\n<td>{row.wind}\n</td>\n</tr>\n'
+            for i, row in enumerate(month_df.itertuples()))
+        pages.append(
+            '<!DOCTYPE html><html><head><meta charset="utf-8"><title>大连历史天气</title>'
+            '<script>var a = "<table>";</script></head><body>'
+            f'<div class="nav"><table class="nav"><tr>{nav_links}</tr></table></div>'
+            '<div class="wdetail"><h1>大连历史天气</h1>'
+            '<table class="b" cellpadding="1" cellspacing="1">\n'
+            '<tr><td><b>日期</b></td><td><b>天气状况</b></td><td><b>气温</b></td><td><b>风力风向</b></td></tr>\n'
+            f'{rows}</table></div><div class="footer">&copy; 天气后报</div></body></html>')
+    return pages
+
+
+def time_backend(pages, backend, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for html in pages:
+            parse_month_page(html, backend)
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比较天气页面各解析后端的速度")
+    parser.add_argument('--fixtures', default=None, help="保存的 .html 页面目录，默认读取 HTTP 缓存")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--backends', nargs='+', default=None, help="要测试的后端，默认全部可用后端")
+    args = parser.parse_args()
+
+    pages = load_fixture_pages(args.fixtures)
+    if pages:
+        print(f"读取了 {len(pages)} 个保存的页面")
+    else:
+        pages = synthesize_pages(os.path.join(DATA_DIR, 'dalian_weather_data.csv'))
+        print(f"没有保存的页面，按 dalian_weather_data.csv 生成了 {len(pages)} 个页面")
+
+    backends = args.backends or list(available_backends())
+    print(f"可用的解析后端：{', '.join(available_backends())}")
+
+    # 以原实现（bs4）的结果为准检查各后端
+    expected = [parse_month_page(html, 'bs4') for html in pages]
+    total_bytes = sum(len(html.encode('utf-8')) for html in pages)
+
+    print(f"\n{'后端':<12} {'最短(秒)':>10} {'中位数(秒)':>10} {'每页(毫秒)':>10} {'MB/秒':>8} {'与bs4一致':>8}")
+    for backend in backends:
+        if backend not in available_backends():
+            print(f"{backend:<12} 未安装，跳过")
+            continue
+        same = [parse_month_page(html, backend) for html in pages] == expected
+        best, median = time_backend(pages, backend, args.repeat)
+        print(f"{backend:<12} {best:>10.4f} {median:>10.4f} {best / len(pages) * 1000:>10.3f} "
+              f"{total_bytes / best / 1e6:>8.2f} {'是' if same else '否':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+天气数据的共用加载模块
+
+各分析脚本（2_temperature、3_wind、4_weather 等）都通过 load_weather 读取爬虫保存的 CSV：
+只解析一次日期、年月、数值温度、昼夜风力等级和昼夜天气，结果缓存到数据目录下的 .cache 中，
+缓存以 CSV 的修改时间、大小和内容哈希为键，CSV 不变时后续脚本直接读取缓存而不再重新解析。
+缓存优先使用 Parquet（需要 pyarrow），不可用或写入失败时改用 pickle；缓存写入失败不影响数据加载。
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+DATE_FORMAT = '%Y年%m月%d日'
+
+# 派生列的处理逻辑变化时增加版本号，使旧缓存失效
+CACHE_VERSION = 1
+
+# 同一进程内多次加载同一文件时直接复用
+_loaded = {}
+
+
+def wind_level(wind_str):
+    """从“东北风 3-4级”这类文本中提取风力等级，“X-Y级”取较大值，无法识别时返回 NaN"""
+    if pd.isna(wind_str):
+        return np.nan
+    try:
+        if '级' in wind_str:
+            if '-' in wind_str:
+                return int(wind_str.split('-')[1].replace('级', ''))
+            else:
+                return int(wind_str.replace('级', ''))
+        else:
+            return np.nan
+    except (ValueError, TypeError):
+        return np.nan
+
+
+def split_weather(weather_str):
+    """把“多云 / 晴”拆分为 (白天天气, 夜间天气)，缺少的部分为 None"""
+    if pd.isna(weather_str):
+        return None, None
+    weathers = [w.strip() for w in weather_str.split('/') if w.strip()]
+    day = weathers[0] if weathers else None
+    night = weathers[1] if len(weathers) >= 2 else None
+    return day, night
+
+
+def count_weather_pairs(data):
+    """统计 load_weather 结果中 (白天天气, 夜间天气) 组合出现的天数，只有一种天气的记录不计入"""
+    pairs = data.dropna(subset=['weather_day', 'weather_night'])
+    return pairs.groupby(['weather_day', 'weather_night']).size().to_dict()
+
+
+def parse_weather(df):
+    """
+    为原始天气数据派生分析用的列，去掉没有日期的空行：
+        date                  datetime64 日期
+        year / month          年份、月份（整数）
+        max_temperature / min_temperature  最高、最低气温（数值）
+        wind_day / wind_night              白天、夜间风力风向
+        wind_level_day / wind_level_night  白天、夜间风力等级，max_wind_level 为两者较大值
+        weather_day / weather_night        白天、夜间天气
+    """
+    df = df.dropna(subset=['date']).reset_index(drop=True)
+
+    try:
+        df['date'] = pd.to_datetime(df['date'], format=DATE_FORMAT)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"日期格式转换失败: {e}，请检查数据中的日期格式是否为 'YYYY年MM月DD日'") from e
+    df['year'] = df['date'].dt.year.astype('int64')
+    df['month'] = df['date'].dt.month.astype('int64')
+
+    # 旧版数据可能只有原始的气温、风力文本
+    if 'max_temperature' not in df.columns or 'min_temperature' not in df.columns:
+        df[['max_temperature', 'min_temperature']] = df['temperature'].str.extract(r'(\d+|\-?\d+)℃ \/ (\d+|\-?\d+)℃')
+    df['max_temperature'] = pd.to_numeric(df['max_temperature'], errors='coerce')
+    df['min_temperature'] = pd.to_numeric(df['min_temperature'], errors='coerce')
+    if 'wind_day' not in df.columns or 'wind_night' not in df.columns:
+        df[['wind_day', 'wind_night']] = df['wind'].str.extract(r'(.*) \/ (.*)')
+
+    # 同样的文本只解析一次
+    levels = {text: wind_level(text) for text in pd.unique(df[['wind_day', 'wind_night']].to_numpy().ravel())}
+    df['wind_level_day'] = df['wind_day'].map(levels).astype('float64')
+    df['wind_level_night'] = df['wind_night'].map(levels).astype('float64')
+    df['max_wind_level'] = df[['wind_level_day', 'wind_level_night']].max(axis=1)
+
+    weathers = {text: split_weather(text) for text in pd.unique(df['weather'])}
+    pairs = [weathers.get(text, (None, None)) for text in df['weather']]
+    df['weather_day'] = [day for day, _ in pairs]
+    df['weather_night'] = [night for _, night in pairs]
+    return df
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_paths(data_path, cache_dir):
+    name = os.path.splitext(os.path.basename(data_path))[0]
+    return os.path.join(cache_dir, f"{name}.meta.json"), os.path.join(cache_dir, name)
+
+
+def _read_cache(meta_path, frame_base, data_path, stat):
+    """缓存有效时返回 (表格, 是否需要更新元数据)，否则返回 (None, False)"""
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None, False
+    if meta.get('version') != CACHE_VERSION:
+        return None, False
+
+    # 修改时间与大小相同即视为未变化；修改时间变了但内容相同（如重新复制）时也可复用
+    touched = meta.get('mtime_ns') != stat.st_mtime_ns or meta.get('size') != stat.st_size
+    if touched and meta.get('sha256') != _file_hash(data_path):
+        return None, False
+
+    try:
+        if meta['format'] == 'parquet':
+            return pd.read_parquet(frame_base + '.parquet'), touched
+        return pd.read_pickle(frame_base + '.pkl'), touched
+    except Exception:
+        return None, False
+
+
+def _write_cache(meta_path, frame_base, data_path, stat, df):
+    try:
+        df.to_parquet(frame_base + '.parquet', index=False)
+        frame_format = 'parquet'
+    except Exception:
+        # 没有安装 pyarrow / fastparquet，或表格中有无法转换为 Parquet 的列时，删除写了一半的文件并改用 pickle
+        try:
+            os.remove(frame_base + '.parquet')
+        except OSError:
+            pass
+        df.to_pickle(frame_base + '.pkl')
+        frame_format = 'pickle'
+    _write_meta(meta_path, data_path, stat, frame_format)
+
+
+def _write_meta(meta_path, data_path, stat, frame_format):
+    meta = {
+        'version': CACHE_VERSION,
+        'source': os.path.abspath(data_path),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': _file_hash(data_path),
+        'format': frame_format,
+    }
+    tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, meta_path)
+
+
+def load_weather(data_path="weather_data/dalian_weather_data.csv", use_cache=True, cache_dir=None):
+    """
+    读取天气 CSV 并返回派生好各列的表格（见 parse_weather），返回的是副本，调用方可以直接修改
+
+    use_cache：是否使用磁盘缓存；cache_dir：缓存目录，默认为数据文件所在目录下的 .cache
+    文件不存在时抛出 FileNotFoundError，日期格式不符时抛出 ValueError
+    """
+    stat = os.stat(data_path)
+    memory_key = (os.path.abspath(data_path), stat.st_mtime_ns, stat.st_size)
+    if memory_key in _loaded:
+        return _loaded[memory_key].copy()
+
+    df = None
+    if use_cache:
+        cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(data_path)), '.cache')
+        meta_path, frame_base = _cache_paths(data_path, cache_dir)
+        df, touched = _read_cache(meta_path, frame_base, data_path, stat)
+        if df is not None:
+            print(f"从缓存读取已解析的天气数据：{data_path}")
+            if touched:
+                try:
+                    with open(meta_path, 'r', encoding='utf-8') as f:
+                        frame_format = json.load(f)['format']
+                    _write_meta(meta_path, data_path, stat, frame_format)
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"更新天气数据缓存信息失败: {e}")
+
+    if df is None:
+        df = parse_weather(pd.read_csv(data_path))
+        if use_cache:
+            # 缓存只是加速手段，写入失败不影响本次加载
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                _write_cache(meta_path, frame_base, data_path, stat, df)
+            except Exception as e:
+                print(f"写入天气数据缓存失败: {e}")
+
+    _loaded[memory_key] = df
+    return df.copy()
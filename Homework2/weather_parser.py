@@ -0,0 +1,187 @@
+"""
+历史天气月份页面的表格解析
+
+天气数据位于页面中 class 为 b 的表格内（旧版页面为 table0），都找不到时取行数最多的表格。
+提供多个解析后端，按 BACKENDS 的顺序选用已安装的第一个：
+    selectolax  基于 C 的 HTML 解析器，速度最快（pip install selectolax）
+    lxml        基于 libxml2 的解析器（pip install lxml）
+    builtin     标准库 html.parser 的流式解析，只记录表格单元格文本，不建立文档树
+    bs4         BeautifulSoup + html.parser，与原实现完全一致，最慢但最宽容
+某个后端解析失败或找不到表格时，依次尝试后面的后端。
+"""
+from functools import lru_cache
+from html.parser import HTMLParser
+
+# 解析后端的优先顺序
+BACKENDS = ['selectolax', 'lxml', 'builtin', 'bs4']
+
+# 按顺序尝试的表格 class
+TABLE_CLASSES = ['b', 'table0']
+
+
+def _pick_table(tables, classes_of, rows_of):
+    """按 TABLE_CLASSES 的顺序选取表格，都没有时选行数最多的表格"""
+    for table_class in TABLE_CLASSES:
+        for table in tables:
+            if table_class in classes_of(table):
+                return table
+    if not tables:
+        return None
+    return max(tables, key=lambda t: len(rows_of(t)))
+
+
+def _parse_selectolax(html):
+    from selectolax.parser import HTMLParser as SelectolaxParser
+
+    tree = SelectolaxParser(html)
+    table = None
+    for table_class in TABLE_CLASSES:
+        table = tree.css_first(f'table.{table_class}')
+        if table is not None:
+            break
+    if table is None:
+        table = _pick_table(tree.css('table'), lambda t: [], lambda t: t.css('tr'))
+    if table is None:
+        return None
+    return [[td.text().strip() for td in tr.css('td')] for tr in table.css('tr')]
+
+
+def _parse_lxml(html):
+    import lxml.html
+
+    tree = lxml.html.fromstring(html)
+    table = None
+    for table_class in TABLE_CLASSES:
+        found = tree.xpath(f"//table[contains(concat(' ', normalize-space(@class), ' '), ' {table_class} ')]")
+        if found:
+            table = found[0]
+            break
+    if table is None:
+        table = _pick_table(tree.xpath('//table'), lambda t: [], lambda t: t.xpath('.//tr'))
+    if table is None:
+        return None
+    return [[td.text_content().strip() for td in tr.xpath('.//td')] for tr in table.xpath('.//tr')]
+
+
+class _TableCollector(HTMLParser):
+    """流式收集页面中所有表格的单元格文本，每个表格记为 (class 列表, 行列表)"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables = []
+        self.open_tables = []
+        self.cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table':
+            classes = (dict(attrs).get('class') or '').split()
+            table = (classes, [])
+            self.tables.append(table)
+            self.open_tables.append(table)
+        elif not self.open_tables:
+            return
+        elif tag == 'tr':
+            self.open_tables[-1][1].append([])
+            self.cell = None
+        elif tag == 'td':
+            rows = self.open_tables[-1][1]
+            if not rows:
+                rows.append([])
+            self.cell = []
+            rows[-1].append(self.cell)
+
+    def handle_endtag(self, tag):
+        if tag == 'table' and self.open_tables:
+            self.open_tables.pop()
+            self.cell = None
+        elif tag in ('td', 'tr'):
+            self.cell = None
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell.append(data)
+
+
+def _parse_builtin(html):
+    collector = _TableCollector()
+    collector.feed(html)
+    collector.close()
+    table = _pick_table(collector.tables, lambda t: t[0], lambda t: t[1])
+    if table is None:
+        return None
+    return [[''.join(cell).strip() for cell in row] for row in table[1]]
+
+
+def _parse_bs4(html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    table = soup.find('table', class_='b') or soup.find('table', class_='table0')
+    if not table:
+        tables = soup.find_all('table')
+        if not tables:
+            return None
+        table = max(tables, key=lambda t: len(t.find_all('tr')))
+    return [[td.text.strip() for td in tr.find_all('td')] for tr in table.find_all('tr')]
+
+
+_PARSERS = {
+    'selectolax': _parse_selectolax,
+    'lxml': _parse_lxml,
+    'builtin': _parse_builtin,
+    'bs4': _parse_bs4,
+}
+
+
+@lru_cache(maxsize=None)
+def available_backends():
+    """返回当前环境中可用的解析后端（只检测一次，避免每个页面都重复尝试导入未安装的库）"""
+    available = []
+    for backend in BACKENDS:
+        try:
+            if backend == 'selectolax':
+                import selectolax.parser  # noqa: F401
+            elif backend == 'lxml':
+                import lxml.html  # noqa: F401
+            elif backend == 'bs4':
+                import bs4  # noqa: F401
+        except ImportError:
+            continue
+        available.append(backend)
+    return tuple(available)
+
+
+def parse_table_rows(html, backend=None):
+    """
+    解析页面中的天气表格，返回 (使用的后端, 各行单元格文本列表)，包括表头行；找不到表格时返回 (None, None)
+
+    backend 为 None 时按 BACKENDS 顺序使用可用的后端；指定后端时先用它，失败再依次尝试其余后端
+    """
+    if backend is not None and backend not in _PARSERS:
+        raise ValueError(f"未知的解析后端：{backend}，可选：{', '.join(BACKENDS)}")
+    order = available_backends()
+    if backend is not None:
+        order = [backend] + [name for name in order if name != backend]
+    for name in order:
+        try:
+            rows = _PARSERS[name](html)
+        except ImportError:
+            continue
+        except Exception as e:
+            print(f"解析后端 {name} 出错，尝试下一个后端: {e}")
+            continue
+        if rows:
+            return name, rows
+    return None, None
+
+
+def parse_month_page(html, backend=None):
+    """
+    解析历史天气月份页面，返回 [日期, 天气状况, 气温, 风力风向] 记录列表
+
+    找不到表格时返回 None；跳过表头行和不足 4 列的行
+    """
+    _, rows = parse_table_rows(html, backend)
+    if rows is None:
+        return None
+    return [row[:4] for row in rows[1:] if len(row) >= 4]
@@ -4,9 +4,14 @@ import time
 import random
 import os
 import json
+import sys
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+# 共用的 HTTP 缓存模块位于仓库根目录的 common 包中
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from common.http_cache import HttpCache
+
 def create_session():
     session = requests.Session()
     retry = Retry(
@@ -23,10 +28,13 @@ def create_session():
     })
     return session
 
-def fetch_html(session, url):
-    # 获取网页内容
+def fetch_html(session, url, cache=None):
+    # 获取网页内容，传入 cache 时优先读取本地缓存
     try:
-        response = session.get(url, timeout=20)
+        if cache is not None:
+            response = cache.get(url, session=session, timeout=20)
+        else:
+            response = session.get(url, timeout=20)
         response.raise_for_status()
         return response.text
     except Exception as e:
@@ -53,6 +61,8 @@ def crawl_conference(conference, years, save_path='data'):
     # 主爬虫逻辑
     os.makedirs(save_path, exist_ok=True)
     session = create_session()
+    # 往届会议的论文列表不会再变化，缓存永不过期
+    cache = HttpCache(os.path.join(save_path, '.http_cache'), max_age=None)
 
     for year in years:
         print(f"Start crawling: {conference} {year}")
@@ -62,7 +72,8 @@ def crawl_conference(conference, years, save_path='data'):
             continue
 
         url = f"https://dblp.org/db/conf/{conference.lower()}/{conference.lower()}{year}.html"
-        html = fetch_html(session, url)
+        cached = cache.is_fresh(url)
+        html = fetch_html(session, url, cache)
         if html is None:
             continue
 
@@ -71,8 +82,9 @@ def crawl_conference(conference, years, save_path='data'):
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(papers, f, ensure_ascii=False, indent=2)
 
-        # 防止被封，加随机延迟
-        time.sleep(random.uniform(3.0, 6.0))
+        # 防止被封，加随机延迟（命中缓存时没有访问网络，无需等待）
+        if not cached:
+            time.sleep(random.uniform(3.0, 6.0))
 
 if __name__ == '__main__':
     # 爬取 AAAI、ICML、CVPR、ICLR、IJCAI 2020至今的论文
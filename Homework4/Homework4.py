@@ -17,8 +17,17 @@
 import requests
 import pandas as pd
 import json
+import os
+import sys
 from datetime import datetime
 
+# 共用的 HTTP 缓存模块位于仓库根目录的 common 包中
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.http_cache import HttpCache
+
+# 开奖数据和专家数据一天内视为新鲜，重复运行时直接读取本地缓存
+cache = HttpCache('.http_cache', max_age=24 * 3600)
+
 all_data = []   # 存放所有数据
 pageSize = 30   # 正常访问网站默认就是30个
 count = 200     # 由于7月份已经有部分开奖，所以截取200个结果，然后再筛选
@@ -45,7 +54,7 @@ headers = {
 # 通过修改网址来连续获取数据
 for pageNum in range(1, (count // pageSize) + 2):
     url = url_template.format(count=count, pageNum=pageNum, pageSize=pageSize)
-    response = requests.get(url, headers=headers)
+    response = cache.get(url, headers=headers)
     if response.status_code != 200:
         print(f"Error fetching page {pageNum}: {response.status_code}")
         continue
@@ -244,7 +253,7 @@ url = "https://i.cmzj.net/expert/rankingList?limit={counter}&page=1&lottery=22&t
 counter = 20
 expertType = 4  # 2->双色球，4->大乐透
 
-resp = requests.get(url.format(counter=counter, expertType=expertType))
+resp = cache.get(url.format(counter=counter, expertType=expertType))
 txt = resp.json()
 txt = txt['data']
 expert = pd.DataFrame(txt)
@@ -257,7 +266,7 @@ extraExpert=[]
 url = "https://i.cmzj.net/expert/queryExpertById?expertId={id}"
 for i in range(counter):
     id = expert.iloc[i]['expertId']
-    resp = requests.get(url.format(id=id))
+    resp = cache.get(url.format(id=id))
     txt = resp.json()
     txt = txt['data']
     extraExpert.append(txt)
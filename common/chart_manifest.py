@@ -0,0 +1,69 @@
+import hashlib
+import json
+import math
+import os
+import threading
+from typing import Dict, Optional
+
+MANIFEST_FILE = ".chart_manifest.json"
+
+
+def _normalize(obj):
+    # 把图表输入转换为可稳定序列化的结构：字典键统一为字符串，numpy/pandas 对象转为 Python 内置类型
+    if hasattr(obj, 'to_dict') and not isinstance(obj, dict):
+        return _normalize(obj.to_dict())
+    if isinstance(obj, dict):
+        return {str(key): _normalize(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple, set)):
+        items = [_normalize(item) for item in obj]
+        return sorted(items, key=repr) if isinstance(obj, set) else items
+    if hasattr(obj, 'tolist') and not isinstance(obj, (str, bytes)):
+        return _normalize(obj.tolist())
+    if isinstance(obj, float) and math.isnan(obj):
+        return "NaN"
+    if isinstance(obj, (str, int, float, bool)) or obj is None:
+        return obj
+    return str(obj)
+
+
+class ChartManifest:
+
+    def __init__(self, output_dir: str, filename: str = MANIFEST_FILE):
+        # 清单与图片放在同一目录，记录每张图片对应的输入哈希
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, filename)
+        self.lock = threading.Lock()
+        self.entries: Dict[str, str] = self._load()
+
+    def _load(self) -> Dict[str, str]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def compute_key(data, style: Optional[Dict] = None) -> str:
+        # 图表输入与样式参数共同决定图片内容，任一变化都会得到不同的哈希
+        payload = json.dumps({'data': _normalize(data), 'style': _normalize(style)},
+                             sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _entry_name(self, image_path: str) -> str:
+        return os.path.relpath(os.path.abspath(image_path), os.path.abspath(self.output_dir))
+
+    def is_fresh(self, image_path: str, key: str) -> bool:
+        # 图片存在且上次渲染时的输入哈希相同，即可跳过重新渲染
+        return os.path.exists(image_path) and self.entries.get(self._entry_name(image_path)) == key
+
+    def record(self, image_path: str, key: str) -> None:
+        with self.lock:
+            self.entries[self._entry_name(image_path)] = key
+            self.save()
+
+    def save(self) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# max_age 取该值时表示沿用缓存对象的默认新鲜期
+_DEFAULT = object()
+
+
+class HttpCache:
+
+    def __init__(self, cache_dir: str = ".http_cache", max_age: Optional[float] = 3600,
+                 max_size_mb: float = 500, max_entry_age: Optional[float] = 90 * 24 * 3600):
+        # max_age：缓存在多少秒内视为新鲜，直接返回而不访问网络；None 表示永不过期
+        # max_size_mb / max_entry_age：缓存总大小上限与条目最长保留时间，超出时淘汰最久未使用的条目
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.max_size = max_size_mb * 1024 * 1024
+        self.max_entry_age = max_entry_age
+        self.lock = threading.Lock()
+        # 缓存正文的总大小，写入时累加，只有超过上限时才扫描整个目录
+        self.total_size = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # 启动时扫描一次，统计已有条目的大小并淘汰过期条目
+        self.evict()
+
+    def _key(self, url: str, params: Optional[Dict] = None) -> str:
+        # 以规范化后的完整 URL（参数按名称排序）作为缓存键
+        if params:
+            params = sorted(params.items())
+        full_url = requests.Request('GET', url, params=params).prepare().url
+        return hashlib.sha256(full_url.encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str):
+        return os.path.join(self.cache_dir, key + ".json"), os.path.join(self.cache_dir, key + ".body")
+
+    def _read_meta(self, key: str) -> Optional[Dict]:
+        meta_path, body_path = self._paths(key)
+        if not (os.path.exists(meta_path) and os.path.exists(body_path)):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _is_fresh(self, meta: Dict, max_age: Optional[float]) -> bool:
+        if max_age is None:
+            return True
+        return time.time() - meta['stored_at'] < max_age
+
+    def is_fresh(self, url: str, params: Optional[Dict] = None, max_age=_DEFAULT) -> bool:
+        # 供调用方判断本次请求是否会命中缓存（例如命中时跳过礼貌性等待）
+        max_age = self.max_age if max_age is _DEFAULT else max_age
+        meta = self._read_meta(self._key(url, params))
+        return meta is not None and self._is_fresh(meta, max_age)
+
+    def get(self, url: str, params: Optional[Dict] = None, session=None,
+            headers: Optional[Dict] = None, max_age=_DEFAULT, **kwargs) -> requests.Response:
+        # session 可以是 requests.Session，也可以直接传 requests 模块
+        session = session or requests
+        max_age = self.max_age if max_age is _DEFAULT else max_age
+        key = self._key(url, params)
+        meta = self._read_meta(key)
+
+        if meta is not None and self._is_fresh(meta, max_age):
+            response = self._build_response(key, meta)
+            if response is not None:
+                return response
+            # 条目刚被其他线程或进程淘汰，按未命中处理
+            meta = None
+
+        # 缓存已过期：带上 ETag / Last-Modified 发条件请求重新验证
+        request_headers = dict(headers or {})
+        if meta is not None:
+            if meta.get('etag'):
+                request_headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                request_headers['If-Modified-Since'] = meta['last_modified']
+
+        response = session.get(url, params=params, headers=request_headers, **kwargs)
+
+        if response.status_code == 304 and meta is not None:
+            meta['stored_at'] = time.time()
+            self._write_atomic(self._paths(key)[0], json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+            cached = self._build_response(key, meta)
+            if cached is not None:
+                return cached
+            # 重新验证期间正文被淘汰，不带条件请求头重新获取
+            response = session.get(url, params=params, headers=headers, **kwargs)
+
+        if response.status_code == 200:
+            self._store(key, response)
+        response.from_cache = False
+        return response
+
+    def _store(self, key: str, response: requests.Response) -> None:
+        meta_path, body_path = self._paths(key)
+        meta = {
+            'url': response.url,
+            'status': response.status_code,
+            'headers': dict(response.headers),
+            'encoding': response.encoding,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'stored_at': time.time()
+        }
+        # 覆盖已有条目时只累加大小的差值
+        try:
+            old_size = os.path.getsize(body_path)
+        except OSError:
+            old_size = 0
+        # 先写正文再写元数据，元数据存在即说明条目完整
+        self._write_atomic(body_path, response.content)
+        self._write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+        with self.lock:
+            self.total_size += len(response.content) - old_size
+            over_limit = self.total_size > self.max_size
+        if over_limit:
+            self.evict()
+
+    def _build_response(self, key: str, meta: Dict) -> Optional[requests.Response]:
+        # evict 可能在读取的同时删除条目（锁只在本进程内有效），读取失败时返回 None 交由调用方按未命中处理
+        body_path = self._paths(key)[1]
+        try:
+            with open(body_path, 'rb') as f:
+                body = f.read()
+            # 用正文文件的修改时间记录最近访问时间，供 LRU 淘汰使用
+            os.utime(body_path)
+        except OSError:
+            return None
+
+        response = requests.Response()
+        response.status_code = meta['status']
+        response.reason = 'OK'
+        response.url = meta['url']
+        response.headers = CaseInsensitiveDict(meta['headers'])
+        response.encoding = meta.get('encoding')
+        response._content = body
+        response.from_cache = True
+        return response
+
+    def evict(self) -> None:
+        # 扫描整个缓存目录：淘汰过期条目，超出容量时淘汰最久未使用的条目，并重新统计总大小
+        with self.lock:
+            now = time.time()
+            entries = []
+            total_size = 0
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".body"):
+                    continue
+                key = name[:-len(".body")]
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                except OSError:
+                    continue
+                if self.max_entry_age is not None and now - stat.st_mtime > self.max_entry_age:
+                    self._remove(key)
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, key))
+                total_size += stat.st_size
+
+            # 超出容量时按最近访问时间从旧到新淘汰，降到上限的 90% 为止，避免之后每次写入都再次扫描目录
+            if total_size > self.max_size:
+                entries.sort()
+                for _, size, key in entries:
+                    if total_size <= self.max_size * 0.9:
+                        break
+                    self._remove(key)
+                    total_size -= size
+            self.total_size = total_size
+
+    def _remove(self, key: str) -> None:
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass